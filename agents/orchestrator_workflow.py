@@ -13,7 +13,7 @@ from typing import Dict, List, Optional, Any
 sys.path.insert(0, str(Path(__file__).parent.parent / "system"))
 
 from .orchestrator import Orchestrator
-from system.workflow_executor import WorkflowExecutor
+from system.workflow_executor import WorkflowExecutor, WorkflowStep
 from system.workflow_history import WorkflowHistory
 from system.workflow_learning import WorkflowLearner
 
@@ -274,6 +274,10 @@ class WorkflowOrchestrator(Orchestrator):
                     break
                 continue
 
+            # Parse the step once so its validation rules are compiled once
+            # and reused across retries
+            parsed_step = WorkflowStep.from_dict(step)
+
             # Retry loop for this step
             step_success = False
             step_validation_passed = False
@@ -325,7 +329,7 @@ Please fix the issues mentioned above and regenerate the files.
                         validation = step.get('validation', [])
                         if validation and project_workspace:
                             validation_result = self.workflow_executor._validate_step_outputs(
-                                step, created_files, project_workspace
+                                parsed_step, created_files, project_workspace
                             )
                             step_validation_passed = validation_result['passed']
 
@@ -15,6 +15,8 @@ class Calculator:
     with comprehensive error handling and input validation.
     """
 
+    __slots__ = ('last_result', 'operation_count')
+
     def __init__(self):
         """Initialize the calculator."""
         self.last_result = None
@@ -6,12 +6,31 @@ Tracks workflow executions for learning, optimization, and analytics.
 """
 
 import json
+import os
+import time
 import yaml
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, groupby
+
+# Prefer orjson for history files when installed; falls back to stdlib json
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    _json_loads = json.loads
 
 
 class StepStatus(Enum):
@@ -31,9 +50,24 @@ class WorkflowStatus(Enum):
     PARTIAL = "partial"
 
 
-@dataclass
+# Wall-clock source for the human-readable timestamps; durations use
+# time.monotonic() instead
+_now = datetime.now
+
+# Status values hoisted out of the enums for hot loops
+_WF_RUNNING = WorkflowStatus.RUNNING.value
+_WF_COMPLETED = WorkflowStatus.COMPLETED.value
+_WF_PARTIAL = WorkflowStatus.PARTIAL.value
+_WF_FAILED = WorkflowStatus.FAILED.value
+_STEP_RUNNING = StepStatus.RUNNING.value
+_STEP_COMPLETED = StepStatus.COMPLETED.value
+_STEP_FAILED = StepStatus.FAILED.value
+_STEP_SKIPPED = StepStatus.SKIPPED.value
+
+
+@dataclass(slots=True, frozen=True)
 class StepExecution:
-    """Record of a single step execution."""
+    """Record of a single step execution (read-only; loaded records are shared)."""
     step_id: str
     step_name: str
     agent: str
@@ -41,21 +75,20 @@ class StepExecution:
     start_time: str
     end_time: Optional[str] = None
     duration: float = 0.0
-    outputs: List[str] = None
+    outputs: List[str] = field(default_factory=list)
     validation_passed: bool = True
-    validation_errors: List[str] = None
+    validation_errors: List[str] = field(default_factory=list)
     error_message: Optional[str] = None
 
-    def __post_init__(self):
-        if self.outputs is None:
-            self.outputs = []
-        if self.validation_errors is None:
-            self.validation_errors = []
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StepExecution':
+        """Create a step record from its stored dict."""
+        return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkflowExecution:
-    """Record of a workflow execution."""
+    """Record of a workflow execution (read-only; loaded records are shared)."""
     execution_id: str
     workflow_name: str
     workflow_version: str
@@ -64,26 +97,86 @@ class WorkflowExecution:
     start_time: str
     end_time: Optional[str] = None
     duration: float = 0.0
-    steps: List[StepExecution] = None
+    steps: List[StepExecution] = field(default_factory=list)
     total_steps: int = 0
     completed_steps: int = 0
     failed_steps: int = 0
     skipped_steps: int = 0
-    quality_gates_passed: List[str] = None
-    quality_gates_failed: List[str] = None
+    quality_gates_passed: List[str] = field(default_factory=list)
+    quality_gates_failed: List[str] = field(default_factory=list)
     user_interventions: int = 0
-    outputs_generated: List[str] = None
+    outputs_generated: List[str] = field(default_factory=list)
     project_path: Optional[str] = None
 
-    def __post_init__(self):
-        if self.steps is None:
-            self.steps = []
-        if self.quality_gates_passed is None:
-            self.quality_gates_passed = []
-        if self.quality_gates_failed is None:
-            self.quality_gates_failed = []
-        if self.outputs_generated is None:
-            self.outputs_generated = []
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'WorkflowExecution':
+        """Create an execution record (and its steps) from its stored dict."""
+        steps = [StepExecution.from_dict(step) for step in data.get('steps', [])]
+        return cls(**dict(data, steps=steps))
+
+
+# Parsed history files: path -> (mtime_ns, size, executions). Each file is
+# held once and its entry is replaced when the file changes on disk
+_history_file_cache: Dict[str, Tuple[int, int, Tuple['WorkflowExecution', ...]]] = {}
+
+
+def _load_history_file(filepath: str, mtime_ns: int, size: int) -> Tuple[WorkflowExecution, ...]:
+    """Load a history file, reusing the parsed copy while its mtime and size are unchanged.
+
+    Day logs (``.jsonl``) hold one execution per line in append order;
+    ``.json`` files from older versions hold a single execution.
+    """
+    cached = _history_file_cache.get(filepath)
+    if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+        return cached[2]
+
+    with open(filepath, 'rb') as f:
+        if not filepath.endswith('.jsonl'):
+            executions = (WorkflowExecution.from_dict(_json_loads(f.read())),)
+        else:
+            records = []
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(WorkflowExecution.from_dict(_json_loads(line)))
+                except Exception as e:
+                    print(f"⚠️  Skipping line {line_no} of {os.path.basename(filepath)}: {e}")
+            executions = tuple(records)
+
+    _history_file_cache[filepath] = (mtime_ns, size, executions)
+    return executions
+
+
+def _load_history_entry(entry: os.DirEntry) -> Tuple[WorkflowExecution, ...]:
+    """Load a history file from a directory entry, reporting errors instead of raising."""
+    try:
+        stat = entry.stat()
+        return _load_history_file(entry.path, stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        print(f"⚠️  Error loading {entry.name}: {e}")
+        return ()
+
+
+def _iter_history_entries(directory: str, max_depth: int = 0) -> Iterator[os.DirEntry]:
+    """Yield history files in ``directory`` and up to ``max_depth`` levels below."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if max_depth:
+                        yield from _iter_history_entries(entry.path, max_depth - 1)
+                elif entry.name.endswith(('.json', '.jsonl')):
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+def _append_to_log(filepath: Path, line: bytes):
+    """Append one line to a day log in a single write, visible to readers on return."""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, 'ab') as log:
+        log.write(line)
 
 
 class WorkflowHistory:
@@ -99,24 +192,44 @@ class WorkflowHistory:
         self.history_dir = self.base_dir / "workflows" / "history"
         self.history_dir.mkdir(parents=True, exist_ok=True)
 
-        self.current_executions: Dict[str, WorkflowExecution] = {}
+        # Running executions are plain dicts in their on-disk shape, so saving
+        # them needs no conversion; records are materialized on read
+        self.current_executions: Dict[str, Dict[str, Any]] = {}
+
+        # Runtime-only bookkeeping for running executions, never persisted:
+        # monotonic start clocks, and step_id -> (step dict, monotonic start)
+        self._execution_clocks: Dict[str, float] = {}
+        self._step_index: Dict[str, Dict[str, Tuple[Dict[str, Any], float]]] = {}
 
     def start_execution(self, workflow_name: str, workflow_version: str,
                        task_description: str, project_path: Optional[str] = None) -> str:
         """Start tracking a new workflow execution."""
-        execution_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-
-        execution = WorkflowExecution(
-            execution_id=execution_id,
-            workflow_name=workflow_name,
-            workflow_version=workflow_version,
-            task_description=task_description,
-            status=WorkflowStatus.RUNNING.value,
-            start_time=datetime.now().isoformat(),
-            project_path=project_path
-        )
-
-        self.current_executions[execution_id] = execution
+        now = _now()
+        execution_id = now.strftime("%Y%m%d_%H%M%S_%f")
+
+        # Keys follow the WorkflowExecution field order
+        self.current_executions[execution_id] = {
+            'execution_id': execution_id,
+            'workflow_name': workflow_name,
+            'workflow_version': workflow_version,
+            'task_description': task_description,
+            'status': _WF_RUNNING,
+            'start_time': now.isoformat(),
+            'end_time': None,
+            'duration': 0.0,
+            'steps': [],
+            'total_steps': 0,
+            'completed_steps': 0,
+            'failed_steps': 0,
+            'skipped_steps': 0,
+            'quality_gates_passed': [],
+            'quality_gates_failed': [],
+            'user_interventions': 0,
+            'outputs_generated': [],
+            'project_path': project_path
+        }
+        self._execution_clocks[execution_id] = time.monotonic()
+        self._step_index[execution_id] = {}
         return execution_id
 
     def start_step(self, execution_id: str, step_id: str, step_name: str, agent: str):
@@ -124,88 +237,78 @@ class WorkflowHistory:
         if execution_id not in self.current_executions:
             return
 
-        step = StepExecution(
-            step_id=step_id,
-            step_name=step_name,
-            agent=agent,
-            status=StepStatus.RUNNING.value,
-            start_time=datetime.now().isoformat()
-        )
+        # Keys follow the StepExecution field order
+        step = {
+            'step_id': step_id,
+            'step_name': step_name,
+            'agent': agent,
+            'status': _STEP_RUNNING,
+            'start_time': _now().isoformat(),
+            'end_time': None,
+            'duration': 0.0,
+            'outputs': [],
+            'validation_passed': True,
+            'validation_errors': [],
+            'error_message': None
+        }
 
-        self.current_executions[execution_id].steps.append(step)
-        self.current_executions[execution_id].total_steps += 1
+        execution = self.current_executions[execution_id]
+        execution['steps'].append(step)
+        self._step_index[execution_id][step_id] = (step, time.monotonic())
+        execution['total_steps'] += 1
+
+    def _finish_step(self, execution_id: str, step_id: str,
+                     status: str) -> Optional[Dict[str, Any]]:
+        """Stamp end time, duration and status on a running step."""
+        entry = self._step_index.get(execution_id, {}).get(step_id)
+        if entry is None:
+            return None
+
+        step, started = entry
+        step['status'] = status
+        step['end_time'] = _now().isoformat()
+        step['duration'] = time.monotonic() - started
+        return step
 
     def complete_step(self, execution_id: str, step_id: str,
                      outputs: List[str] = None, validation_passed: bool = True,
                      validation_errors: List[str] = None):
         """Mark a step as completed."""
-        if execution_id not in self.current_executions:
+        step = self._finish_step(execution_id, step_id, _STEP_COMPLETED)
+        if step is None:
             return
 
         execution = self.current_executions[execution_id]
 
-        # Find the step
-        for step in execution.steps:
-            if step.step_id == step_id:
-                step.status = StepStatus.COMPLETED.value
-                step.end_time = datetime.now().isoformat()
-
-                # Calculate duration
-                start = datetime.fromisoformat(step.start_time)
-                end = datetime.fromisoformat(step.end_time)
-                step.duration = (end - start).total_seconds()
+        if outputs:
+            step['outputs'] = outputs
+            execution['outputs_generated'].extend(outputs)
 
-                if outputs:
-                    step.outputs = outputs
-                    execution.outputs_generated.extend(outputs)
+        step['validation_passed'] = validation_passed
+        if validation_errors:
+            step['validation_errors'] = validation_errors
 
-                step.validation_passed = validation_passed
-                if validation_errors:
-                    step.validation_errors = validation_errors
-
-                execution.completed_steps += 1
-                break
+        execution['completed_steps'] += 1
 
     def fail_step(self, execution_id: str, step_id: str, error_message: str):
         """Mark a step as failed."""
-        if execution_id not in self.current_executions:
+        step = self._finish_step(execution_id, step_id, _STEP_FAILED)
+        if step is None:
             return
 
-        execution = self.current_executions[execution_id]
-
-        # Find the step
-        for step in execution.steps:
-            if step.step_id == step_id:
-                step.status = StepStatus.FAILED.value
-                step.end_time = datetime.now().isoformat()
-                step.error_message = error_message
-
-                # Calculate duration
-                start = datetime.fromisoformat(step.start_time)
-                end = datetime.fromisoformat(step.end_time)
-                step.duration = (end - start).total_seconds()
-
-                execution.failed_steps += 1
-                break
+        step['error_message'] = error_message
+        self.current_executions[execution_id]['failed_steps'] += 1
 
     def skip_step(self, execution_id: str, step_id: str, reason: str = "Optional step"):
         """Mark a step as skipped."""
-        if execution_id not in self.current_executions:
+        entry = self._step_index.get(execution_id, {}).get(step_id)
+        if entry is None:
             return
 
-        execution = self.current_executions[execution_id]
-
-        # Find the step (or add if not exists)
-        found = False
-        for step in execution.steps:
-            if step.step_id == step_id:
-                step.status = StepStatus.SKIPPED.value
-                step.error_message = reason
-                found = True
-                break
-
-        if found:
-            execution.skipped_steps += 1
+        step = entry[0]
+        step['status'] = _STEP_SKIPPED
+        step['error_message'] = reason
+        self.current_executions[execution_id]['skipped_steps'] += 1
 
     def record_quality_gate(self, execution_id: str, gate_name: str, passed: bool):
         """Record quality gate result."""
@@ -215,16 +318,16 @@ class WorkflowHistory:
         execution = self.current_executions[execution_id]
 
         if passed:
-            execution.quality_gates_passed.append(gate_name)
+            execution['quality_gates_passed'].append(gate_name)
         else:
-            execution.quality_gates_failed.append(gate_name)
+            execution['quality_gates_failed'].append(gate_name)
 
     def record_user_intervention(self, execution_id: str):
         """Record that user intervened in workflow."""
         if execution_id not in self.current_executions:
             return
 
-        self.current_executions[execution_id].user_interventions += 1
+        self.current_executions[execution_id]['user_interventions'] += 1
 
     def complete_execution(self, execution_id: str, success: bool = True):
         """Complete a workflow execution."""
@@ -232,75 +335,201 @@ class WorkflowHistory:
             return
 
         execution = self.current_executions[execution_id]
-        execution.end_time = datetime.now().isoformat()
+        execution['end_time'] = _now().isoformat()
 
-        # Calculate duration
-        start = datetime.fromisoformat(execution.start_time)
-        end = datetime.fromisoformat(execution.end_time)
-        execution.duration = (end - start).total_seconds()
+        execution['duration'] = time.monotonic() - self._execution_clocks[execution_id]
 
         # Determine status
-        if success and execution.failed_steps == 0:
-            execution.status = WorkflowStatus.COMPLETED.value
-        elif execution.failed_steps > 0 and execution.completed_steps > 0:
-            execution.status = WorkflowStatus.PARTIAL.value
+        failed_steps = execution['failed_steps']
+        if success and failed_steps == 0:
+            execution['status'] = _WF_COMPLETED
+        elif failed_steps > 0 and execution['completed_steps'] > 0:
+            execution['status'] = _WF_PARTIAL
         else:
-            execution.status = WorkflowStatus.FAILED.value
+            execution['status'] = _WF_FAILED
 
         # Save to file
         self._save_execution(execution)
 
         # Remove from current executions
         del self.current_executions[execution_id]
+        del self._execution_clocks[execution_id]
+        del self._step_index[execution_id]
 
-    def _save_execution(self, execution: WorkflowExecution):
-        """Save execution to history file."""
-        # Create filename with date and workflow name
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        filename = f"{date_str}_{execution.workflow_name}_{execution.execution_id}.json"
-        filepath = self.history_dir / filename
+    def _save_execution(self, execution: Dict[str, Any]):
+        """Append execution to its workflow's day log."""
+        # One JSONL log per workflow per day
+        date_str = _now().strftime("%Y-%m-%d")
+        workflow_name = execution['workflow_name']
+        filepath = self.history_dir / workflow_name / f"{date_str}.jsonl"
 
-        # Convert to dict
-        execution_dict = asdict(execution)
-
-        # Save as JSON
         try:
-            with open(filepath, 'w') as f:
-                json.dump(execution_dict, f, indent=2)
+            _append_to_log(filepath, _json_dumps(execution) + b"\n")
         except Exception as e:
             print(f"⚠️  Error saving execution history: {e}")
 
+    def _history_files(self, workflow_name: Optional[str] = None) -> List[os.DirEntry]:
+        """List history files, newest day first.
+
+        Executions are appended to ``{workflow}/{date}.jsonl`` day logs;
+        ``{date}_{workflow}_{id}.json`` files written by older versions flat
+        in the history root are still picked up. Every file name starts with
+        its ``YYYY-MM-DD`` date.
+        """
+        history_dir = str(self.history_dir)
+        if workflow_name:
+            prefix = f"{workflow_name}_"
+            files = chain(
+                _iter_history_entries(os.path.join(history_dir, workflow_name)),
+                # Legacy names are "{YYYY-MM-DD}_{workflow}_{execution_id}.json"
+                (e for e in _iter_history_entries(history_dir)
+                 if e.name[11:].startswith(prefix))
+            )
+        else:
+            files = _iter_history_entries(history_dir, max_depth=1)
+
+        return sorted(files, key=lambda e: e.name[:10], reverse=True)
+
+    def _iter_history_days(self, workflow_name: Optional[str] = None) -> Iterator[List[WorkflowExecution]]:
+        """Yield each day's executions, newest day first and newest first within a day.
+
+        Files are re-listed on every call so executions saved by other
+        WorkflowHistory instances or processes are seen; unchanged files are
+        served from the parsed-file cache.
+        """
+        # A day usually is a single day log; when it spans several files (all
+        # workflows, or legacy .json files) they are loaded concurrently
+        pool = None
+        try:
+            for _, day_group in groupby(self._history_files(workflow_name),
+                                        key=lambda e: e.name[:10]):
+                day_entries = list(day_group)
+                if len(day_entries) == 1:
+                    loaded_files = [_load_history_entry(day_entries[0])]
+                else:
+                    if pool is None:
+                        pool = ThreadPoolExecutor(max_workers=8)
+                    loaded_files = pool.map(_load_history_entry, day_entries)
+
+                day = [e for loaded in loaded_files for e in loaded
+                       if workflow_name is None or e.workflow_name == workflow_name]
+                # Execution ids are start timestamps, so they order chronologically
+                day.sort(key=lambda e: e.execution_id, reverse=True)
+                yield day
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
     def get_execution_history(self, workflow_name: Optional[str] = None,
                              limit: int = 100) -> List[WorkflowExecution]:
         """Get execution history."""
-        history = []
+        return list(self.iter_execution_history(workflow_name, limit))
 
-        # Get all history files
-        files = sorted(self.history_dir.glob("*.json"), reverse=True)
-
-        for filepath in files[:limit]:
-            if workflow_name and workflow_name not in filepath.name:
-                continue
-
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    execution = WorkflowExecution(**data)
+    def iter_execution_history(self, workflow_name: Optional[str] = None,
+                               limit: int = 100) -> Iterator[WorkflowExecution]:
+        """Iterate execution history, newest first, reading one day's files at a time."""
+        if limit <= 0:
+            return
+        days = self._iter_history_days(workflow_name or None)
+        try:
+            for day in days:
+                yield from day[:limit]
+                limit -= len(day)
+                if limit <= 0:
+                    break
+        finally:
+            days.close()
+
+    def get_execution_histories(self, workflow_names: List[str],
+                                limit: int = 100) -> Dict[str, List[WorkflowExecution]]:
+        """Get the execution history of several workflows from one pass over the day logs.
+
+        Each list holds the same executions ``get_execution_history(name, limit)``
+        returns; reading stops once every workflow has ``limit`` executions.
+        """
+        histories = {name: [] for name in workflow_names}
+        unfilled = len(histories) if limit > 0 else 0
+        days = self._iter_history_days()
+        try:
+            for day in days:
+                if not unfilled:
+                    break
+                for execution in day:
+                    executions = histories.get(execution.workflow_name)
+                    if executions is not None and len(executions) < limit:
+                        executions.append(execution)
+                        if len(executions) == limit:
+                            unfilled -= 1
+        finally:
+            days.close()
+        return histories
+
+    def _aggregate_stats(self, history: List[WorkflowExecution]) -> Dict[str, Any]:
+        """Accumulate execution and per-step totals in a single pass."""
+        completed = partial = failed = 0
+        total_duration = 0.0
+        step_stats = {}
 
-                    # Convert step dicts back to StepExecution objects
-                    execution.steps = [StepExecution(**step) for step in data['steps']]
+        for execution in history:
+            total_duration += execution.duration
+            status = execution.status
+            if status == _WF_COMPLETED:
+                completed += 1
+            elif status == _WF_PARTIAL:
+                partial += 1
+            elif status == _WF_FAILED:
+                failed += 1
+
+            for step in execution.steps:
+                stats = step_stats.get(step.step_id)
+                if stats is None:
+                    stats = step_stats[step.step_id] = {
+                        'step_name': step.step_name,
+                        'agent': step.agent,
+                        'total_executions': 0,
+                        'completed': 0,
+                        'failed': 0,
+                        'skipped': 0,
+                        'avg_duration': 0.0,
+                        'total_duration': 0.0
+                    }
+
+                stats['total_executions'] += 1
+
+                step_status = step.status
+                if step_status == _STEP_COMPLETED:
+                    stats['completed'] += 1
+                elif step_status == _STEP_FAILED:
+                    stats['failed'] += 1
+                elif step_status == _STEP_SKIPPED:
+                    stats['skipped'] += 1
+
+                if step.duration > 0:
+                    stats['total_duration'] += step.duration
 
-                    history.append(execution)
-            except Exception as e:
-                print(f"⚠️  Error loading {filepath.name}: {e}")
+        return {
+            'total': len(history),
+            'completed': completed,
+            'partial': partial,
+            'failed': failed,
+            'total_duration': total_duration,
+            'step_stats': step_stats,
+            'last_execution': history[0].start_time if history else None
+        }
 
-        return history
+    def get_workflow_statistics(self, workflow_name: str,
+                                executions: Optional[List[WorkflowExecution]] = None) -> Dict[str, Any]:
+        """Get statistics for a specific workflow.
 
-    def get_workflow_statistics(self, workflow_name: str) -> Dict[str, Any]:
-        """Get statistics for a specific workflow."""
-        history = self.get_execution_history(workflow_name=workflow_name)
+        Pass ``executions`` (from ``get_execution_history(workflow_name)``) to
+        compute the statistics over history already loaded.
+        """
+        if executions is None:
+            executions = self.get_execution_history(workflow_name=workflow_name)
+        agg = self._aggregate_stats(executions)
+        total = agg['total']
 
-        if not history:
+        if not total:
             return {
                 'workflow_name': workflow_name,
                 'total_executions': 0,
@@ -309,48 +538,12 @@ class WorkflowHistory:
                 'total_duration': 0.0
             }
 
-        total = len(history)
-        completed = sum(1 for e in history if e.status == WorkflowStatus.COMPLETED.value)
-        partial = sum(1 for e in history if e.status == WorkflowStatus.PARTIAL.value)
-        failed = sum(1 for e in history if e.status == WorkflowStatus.FAILED.value)
-
-        total_duration = sum(e.duration for e in history)
-        avg_duration = total_duration / total if total > 0 else 0.0
-
-        # Step statistics
-        all_steps = []
-        for execution in history:
-            all_steps.extend(execution.steps)
-
-        step_stats = {}
-        for step in all_steps:
-            if step.step_id not in step_stats:
-                step_stats[step.step_id] = {
-                    'step_name': step.step_name,
-                    'agent': step.agent,
-                    'total_executions': 0,
-                    'completed': 0,
-                    'failed': 0,
-                    'skipped': 0,
-                    'avg_duration': 0.0,
-                    'total_duration': 0.0
-                }
-
-            stats = step_stats[step.step_id]
-            stats['total_executions'] += 1
-
-            if step.status == StepStatus.COMPLETED.value:
-                stats['completed'] += 1
-            elif step.status == StepStatus.FAILED.value:
-                stats['failed'] += 1
-            elif step.status == StepStatus.SKIPPED.value:
-                stats['skipped'] += 1
-
-            if step.duration > 0:
-                stats['total_duration'] += step.duration
+        completed = agg['completed']
+        total_duration = agg['total_duration']
+        step_stats = agg['step_stats']
 
         # Calculate averages
-        for step_id, stats in step_stats.items():
+        for stats in step_stats.values():
             if stats['completed'] > 0:
                 stats['avg_duration'] = stats['total_duration'] / stats['completed']
             stats['success_rate'] = stats['completed'] / stats['total_executions'] if stats['total_executions'] > 0 else 0.0
@@ -359,13 +552,13 @@ class WorkflowHistory:
             'workflow_name': workflow_name,
             'total_executions': total,
             'completed': completed,
-            'partial': partial,
-            'failed': failed,
-            'success_rate': completed / total if total > 0 else 0.0,
-            'avg_duration': avg_duration,
+            'partial': agg['partial'],
+            'failed': agg['failed'],
+            'success_rate': completed / total,
+            'avg_duration': total_duration / total,
             'total_duration': total_duration,
             'step_statistics': step_stats,
-            'last_execution': history[0].start_time if history else None
+            'last_execution': agg['last_execution']
         }
 
     def get_global_statistics(self) -> Dict[str, Any]:
@@ -380,50 +573,42 @@ class WorkflowHistory:
                 'avg_duration': 0.0
             }
 
-        # Group by workflow
-        by_workflow = {}
+        # Count by workflow, along with completions and duration, in one pass
+        wf_counts = Counter()
+        completed = 0
+        total_duration = 0.0
         for execution in all_history:
-            name = execution.workflow_name
-            if name not in by_workflow:
-                by_workflow[name] = []
-            by_workflow[name].append(execution)
+            wf_counts[execution.workflow_name] += 1
+            total_duration += execution.duration
+            if execution.status == _WF_COMPLETED:
+                completed += 1
 
         total = len(all_history)
-        completed = sum(1 for e in all_history if e.status == WorkflowStatus.COMPLETED.value)
-
-        total_duration = sum(e.duration for e in all_history)
         avg_duration = total_duration / total if total > 0 else 0.0
 
         # Most used workflows
-        most_used = sorted(
-            [(name, len(execs)) for name, execs in by_workflow.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
+        most_used = wf_counts.most_common(5)
 
         return {
             'total_executions': total,
-            'workflows_used': len(by_workflow),
+            'workflows_used': len(wf_counts),
             'success_rate': completed / total if total > 0 else 0.0,
             'avg_duration': avg_duration,
             'total_duration': total_duration,
             'most_used_workflows': most_used,
-            'by_workflow': {name: len(execs) for name, execs in by_workflow.items()}
+            'by_workflow': dict(wf_counts)
         }
 
 
 def format_duration(seconds: float) -> str:
     """Format duration in seconds to human-readable string."""
-    if seconds < 60:
-        return f"{seconds:.1f}s"
-    elif seconds < 3600:
-        minutes = int(seconds // 60)
-        secs = seconds % 60
-        return f"{minutes}m {secs:.0f}s"
-    else:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    if hours:
         return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {secs:.0f}s"
+    return f"{secs:.1f}s"
 
 
 if __name__ == "__main__":
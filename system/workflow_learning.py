@@ -7,13 +7,67 @@ and auto-generate new workflow templates.
 """
 
 import json
+import os
+import re
 import yaml
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, FrozenSet, List, Optional, Any, Tuple
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
-from workflow_history import WorkflowHistory, WorkflowExecution, StepStatus
+# Emit YAML through libyaml when available
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+from workflow_history import WorkflowHistory, StepStatus, format_duration
+
+# Report durations repeat across workflows, so memoize their formatting
+_format_duration = lru_cache(maxsize=256)(format_duration)
+
+# Keyword tokens: runs of letters or digits (any script) longer than three characters
+_TOKEN_RE = re.compile(r"[^\W_]{4,}")
+
+# Common words ignored when extracting task keywords
+_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'should', 'could', 'may', 'might', 'must', 'can', 'this',
+    'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'
+})
+
+
+@lru_cache(maxsize=None)
+def _get_stemmer() -> Callable[[str], str]:
+    """Porter stemmer from nltk when installed, otherwise words pass through unchanged."""
+    try:
+        from nltk.stem import PorterStemmer
+    except ImportError:
+        return str
+    return lru_cache(maxsize=8192)(PorterStemmer().stem)
+
+
+@lru_cache(maxsize=2048)
+def _keywords(text: str) -> Tuple[str, ...]:
+    """Tokenize text into keywords; cached since task descriptions repeat."""
+    return tuple(w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOP_WORDS)
+
+
+@lru_cache(maxsize=2048)
+def _pattern_key(text: str) -> Tuple[str, str]:
+    """Return (grouping key, display keywords) for a task description.
+
+    The grouping key is built from stemmed keywords so word forms ("clicks",
+    "clicked") land in one group; the display keywords are the matching
+    unstemmed words, used wherever a pattern's keywords are shown or matched.
+    """
+    stem = _get_stemmer()
+    chosen = sorted((stem(w), w) for w in _keywords(text))[:5]  # Use first 5 keywords
+    return " ".join(s for s, _ in chosen), " ".join(w for _, w in chosen)
 
 
 class WorkflowLearner:
@@ -30,9 +84,41 @@ class WorkflowLearner:
         self.learned_dir = self.base_dir / "workflows" / "learned"
         self.learned_dir.mkdir(parents=True, exist_ok=True)
 
+        # workflow_name -> (ids of the executions analyzed, analyze_workflow result)
+        self._analysis_cache: Dict[str, Tuple[Tuple[str, ...], Dict[str, Any]]] = {}
+
+        # Task pattern groups from the last detect_task_patterns run, and the
+        # ids of the executions counted in them
+        self._pattern_groups: Dict[str, Dict[str, Any]] = {}
+        self._pattern_ids: FrozenSet[str] = frozenset()
+
     def analyze_workflow(self, workflow_name: str) -> Dict[str, Any]:
         """Analyze a workflow and suggest improvements."""
-        stats = self.history.get_workflow_statistics(workflow_name)
+        executions = self.history.get_execution_history(workflow_name=workflow_name)
+        return self._cached_analysis(workflow_name, executions)
+
+    def analyze_workflows_bulk(self, workflow_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Analyze several workflows from a single read of the execution history."""
+        histories = self.history.get_execution_histories(workflow_names)
+        return {name: self._cached_analysis(name, executions)
+                for name, executions in histories.items()}
+
+    def _cached_analysis(self, workflow_name: str, executions: List[Any]) -> Dict[str, Any]:
+        """Return the analysis of ``executions``, reusing it while the same executions are in view."""
+        # Execution ids identify the window exactly, including executions
+        # that completed after a later-started one
+        version = tuple(e.execution_id for e in executions)
+        cached = self._analysis_cache.get(workflow_name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        analysis = self._analyze_workflow(workflow_name, executions)
+        self._analysis_cache[workflow_name] = (version, analysis)
+        return analysis
+
+    def _analyze_workflow(self, workflow_name: str, executions: List[Any]) -> Dict[str, Any]:
+        """Compute the analysis for a workflow from statistics over ``executions``."""
+        stats = self.history.get_workflow_statistics(workflow_name, executions)
 
         if stats['total_executions'] == 0:
             return {
@@ -43,11 +129,14 @@ class WorkflowLearner:
         improvements = []
         step_stats = stats.get('step_statistics', {})
 
-        # Analyze step performance
+        # Analyze step performance; thresholds are compared on raw counts so
+        # rates are only computed for steps that need a recommendation
         for step_id, step_data in step_stats.items():
+            total = step_data['total_executions']
+
             # Check failure rate
-            failure_rate = step_data['failed'] / step_data['total_executions']
-            if failure_rate > 0.2:  # More than 20% failures
+            if step_data['failed'] > 0.2 * total:  # More than 20% failures
+                failure_rate = step_data['failed'] / total
                 improvements.append({
                     'type': 'high_failure_rate',
                     'step_id': step_id,
@@ -58,8 +147,8 @@ class WorkflowLearner:
                 })
 
             # Check if step is always skipped
-            skip_rate = step_data['skipped'] / step_data['total_executions']
-            if skip_rate > 0.8:  # Skipped more than 80% of the time
+            if step_data['skipped'] > 0.8 * total:  # Skipped more than 80% of the time
+                skip_rate = step_data['skipped'] / total
                 improvements.append({
                     'type': 'frequently_skipped',
                     'step_id': step_id,
@@ -69,9 +158,7 @@ class WorkflowLearner:
                                     f"Consider making it optional or removing it."
                 })
 
-            # Check if actual duration differs significantly from expected
-            avg_duration = step_data['avg_duration']
-            # TODO: Compare with expected timeout from workflow template
+            # TODO: Compare avg_duration with expected timeout from workflow template
 
         # Check overall success rate
         if stats['success_rate'] < 0.7:  # Less than 70% success
@@ -91,37 +178,27 @@ class WorkflowLearner:
 
     def detect_task_patterns(self, min_occurrences: int = 3) -> List[Dict[str, Any]]:
         """Detect repeated task patterns that could become workflows."""
-        all_history = self.history.get_execution_history(limit=500)
-
-        # Group by task keywords
-        task_patterns = defaultdict(list)
-
-        for execution in all_history:
-            # Extract keywords from task description
-            keywords = self._extract_keywords(execution.task_description)
-
-            # Group executions with similar keywords
-            key = " ".join(sorted(keywords)[:5])  # Use first 5 keywords
-            task_patterns[key].append(execution)
+        task_patterns = self._update_pattern_groups(limit=500)
 
         # Find patterns with enough occurrences
         potential_workflows = []
 
-        for keywords, executions in task_patterns.items():
-            if len(executions) < min_occurrences:
+        for group in task_patterns.values():
+            count = group['count']
+            if count < min_occurrences:
                 continue
 
             # Analyze common agent sequences
-            agent_sequences = self._find_common_agent_sequences(executions)
+            agent_sequences = self._find_common_agent_sequences(group['agent_seqs'], top_n=1)
 
             if agent_sequences:
                 potential_workflows.append({
-                    'keywords': keywords,
-                    'occurrences': len(executions),
+                    'keywords': group['keywords'],
+                    'occurrences': count,
                     'agent_sequence': agent_sequences[0],  # Most common sequence
-                    'avg_duration': sum(e.duration for e in executions) / len(executions),
-                    'success_rate': sum(1 for e in executions if e.status == 'completed') / len(executions),
-                    'sample_tasks': [e.task_description for e in executions[:3]]
+                    'avg_duration': group['duration_sum'] / count,
+                    'success_rate': group['ok'] / count,
+                    'sample_tasks': list(group['samples'])
                 })
 
         # Sort by occurrences
@@ -129,48 +206,121 @@ class WorkflowLearner:
 
         return potential_workflows
 
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text."""
-        # Simple keyword extraction - remove common words
-        stop_words = {'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                     'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
-                     'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                     'would', 'should', 'could', 'may', 'might', 'must', 'can', 'this',
-                     'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they'}
+    def _update_pattern_groups(self, limit: int) -> Dict[str, Dict[str, Any]]:
+        """Group the newest ``limit`` executions by task keywords.
+
+        Groups from the previous run are reused: when every execution they
+        count is still in the window and the executions not yet counted are
+        all newer, only those are grouped and merged in front of the cached
+        groups. Otherwise the window is regrouped.
+        """
+        window = self.history.get_execution_history(limit=limit)
+        window_ids = frozenset(e.execution_id for e in window)
+        counted = self._pattern_ids
+
+        new_executions = [e for e in window if e.execution_id not in counted]
+        # Executions that fell out of the window can't be taken back out of
+        # the counts, and one that started before a counted execution but
+        # finished after it belongs behind it in the groups' first-seen order
+        if counted <= window_ids and all(
+                e.execution_id not in counted for e in window[:len(new_executions)]):
+            if new_executions:
+                self._pattern_groups = self._merge_pattern_groups(
+                    self._group_executions(new_executions), self._pattern_groups)
+        else:
+            self._pattern_groups = self._group_executions(window)
 
-        words = text.lower().split()
-        keywords = [w.strip('.,!?;:') for w in words if w not in stop_words and len(w) > 3]
+        self._pattern_ids = window_ids
+        return self._pattern_groups
 
-        return keywords
+    def _group_executions(self, executions: List[Any]) -> Dict[str, Dict[str, Any]]:
+        """Group executions by task keywords, keeping only running aggregates per group."""
+        completed = StepStatus.COMPLETED.value
 
-    def _find_common_agent_sequences(self, executions: List[WorkflowExecution]) -> List[List[str]]:
-        """Find common agent sequences across executions."""
-        sequences = []
+        task_patterns = defaultdict(lambda: {
+            'keywords': '',
+            'count': 0,
+            'duration_sum': 0.0,
+            'ok': 0,
+            'samples': [],
+            'agent_seqs': Counter()
+        })
 
         for execution in executions:
-            # Extract agent sequence (only completed steps)
-            sequence = [
-                step.agent for step in execution.steps
-                if step.status == StepStatus.COMPLETED.value
-            ]
+            # Group executions with similar (stemmed) keywords
+            key, keywords = _pattern_key(execution.task_description)
+            group = task_patterns[key]
+            if group['count'] == 0:
+                group['keywords'] = keywords
+            group['count'] += 1
+            group['duration_sum'] += execution.duration
+            if execution.status == completed:
+                group['ok'] += 1
+            if len(group['samples']) < 3:
+                group['samples'].append(execution.task_description)
+
+            # Agent sequence (only completed steps)
+            sequence = tuple(step.agent for step in execution.steps if step.status == completed)
             if sequence:
-                sequences.append(tuple(sequence))
+                group['agent_seqs'][sequence] += 1
+
+        return dict(task_patterns)
+
+    def _merge_pattern_groups(self, newer: Dict[str, Dict[str, Any]],
+                              older: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Merge groups of newer executions in front of older ones.
+
+        Keys and agent sequences keep newest-first first-seen order, the same
+        order a full regrouping would produce.
+        """
+        merged = {}
+        for key, group in newer.items():
+            previous = older.get(key)
+            if previous is None:
+                merged[key] = group
+                continue
+            merged[key] = {
+                'keywords': group['keywords'],
+                'count': group['count'] + previous['count'],
+                'duration_sum': group['duration_sum'] + previous['duration_sum'],
+                'ok': group['ok'] + previous['ok'],
+                'samples': (group['samples'] + previous['samples'])[:3],
+                'agent_seqs': group['agent_seqs'] + previous['agent_seqs']
+            }
+        for key, group in older.items():
+            if key not in merged:
+                merged[key] = group
+        return merged
 
-        # Count sequences
-        sequence_counts = Counter(sequences)
+    def _extract_keywords(self, text: str) -> List[str]:
+        """Extract keywords from text."""
+        return list(_keywords(text))
 
-        # Return most common sequences
-        return [list(seq) for seq, count in sequence_counts.most_common(5)]
+    def _find_common_agent_sequences(self, sequence_counts: Counter,
+                                     top_n: int = 1) -> List[List[str]]:
+        """Find the ``top_n`` most common agent sequences from per-sequence counts."""
+        return [list(seq) for seq, count in sequence_counts.most_common(top_n)]
 
     def generate_workflow_template(self, pattern: Dict[str, Any], name: str) -> Dict[str, Any]:
         """Generate a workflow template from a detected pattern."""
+        return self._generate_one(pattern, name, datetime.now().strftime('%Y-%m-%d'))
+
+    def generate_workflow_templates(self, patterns: List[Dict[str, Any]],
+                                    names: List[str]) -> List[Dict[str, Any]]:
+        """Generate workflow templates for several patterns, stamped with one date."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        return [self._generate_one(pattern, name, today)
+                for pattern, name in zip(patterns, names)]
+
+    def _generate_one(self, pattern: Dict[str, Any], name: str, today: str) -> Dict[str, Any]:
+        """Build a workflow template from a pattern, dated ``today``."""
         workflow = {
             'name': name,
             'version': '1.0.0',
             'description': f"Auto-generated workflow based on {pattern['occurrences']} similar tasks",
             'author': 'learning-system',
-            'created': datetime.now().strftime('%Y-%m-%d'),
-            'updated': datetime.now().strftime('%Y-%m-%d'),
+            'created': today,
+            'updated': today,
             'task_types': pattern['keywords'].split(),
             'agents_required': [],
             'agents_optional': [],
@@ -200,7 +350,7 @@ class WorkflowLearner:
 
         # Generate steps from agent sequence
         agent_sequence = pattern['agent_sequence']
-        workflow['agents_required'] = list(set(agent_sequence))
+        workflow['agents_required'] = list(dict.fromkeys(agent_sequence))
 
         for i, agent in enumerate(agent_sequence):
             step_id = f"step{i+1}"
@@ -228,16 +378,44 @@ class WorkflowLearner:
 
         try:
             with open(filepath, 'w') as f:
-                yaml.dump(workflow, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(workflow, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
 
             return str(filepath)
         except Exception as e:
             print(f"❌ Error saving learned workflow: {e}")
             return ""
 
-    def optimize_workflow_timeouts(self, workflow_name: str) -> Dict[str, int]:
-        """Suggest optimized timeouts based on actual execution times."""
-        stats = self.history.get_workflow_statistics(workflow_name)
+    def save_learned_workflows(self, workflows: List[Dict[str, Any]]) -> List[str]:
+        """Save several learned workflow templates concurrently; each goes to its own file.
+
+        Returns a path per workflow. A workflow whose name repeats an earlier
+        one is not saved (two writers would race on the same file) and gets "".
+        """
+        # workflow name -> position of its first occurrence
+        first_index: Dict[str, int] = {}
+        for i, workflow in enumerate(workflows):
+            if workflow['name'] in first_index:
+                print(f"❌ Duplicate learned workflow name '{workflow['name']}', not saved")
+            else:
+                first_index[workflow['name']] = i
+
+        paths = [""] * len(workflows)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            saved = pool.map(self.save_learned_workflow,
+                             [workflows[i] for i in first_index.values()])
+            for i, path in zip(first_index.values(), saved):
+                paths[i] = path
+        return paths
+
+    def optimize_workflow_timeouts(self, workflow_name: str,
+                                   stats: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """Suggest optimized timeouts based on actual execution times.
+
+        Pass ``stats`` (e.g. ``analyze_workflow(name)['statistics']``) to reuse
+        statistics already computed for this workflow.
+        """
+        if stats is None:
+            stats = self.history.get_workflow_statistics(workflow_name)
 
         if stats['total_executions'] == 0:
             return {}
@@ -276,93 +454,81 @@ class WorkflowLearner:
 
     def export_learning_report(self, output_path: str = "workflows/LEARNING_REPORT.md"):
         """Export a comprehensive learning report."""
-        report = []
-        report.append("# Workflow Learning Report\n")
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        output_file = self.base_dir / output_path
+        output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Global statistics
+        # Gather everything before touching the file, so a failure here leaves
+        # the previous report in place
         global_stats = self.history.get_global_statistics()
-        report.append("## Global Statistics\n\n")
-        report.append(f"- **Total Executions**: {global_stats['total_executions']}\n")
-        report.append(f"- **Workflows Used**: {global_stats['workflows_used']}\n")
-        report.append(f"- **Overall Success Rate**: {global_stats['success_rate']:.1%}\n")
-        report.append(f"- **Average Duration**: {self._format_duration(global_stats['avg_duration'])}\n\n")
-
-        # Most used workflows
-        if global_stats.get('most_used_workflows'):
-            report.append("## Most Used Workflows\n\n")
-            for name, count in global_stats['most_used_workflows']:
-                report.append(f"1. **{name}**: {count} executions\n")
-            report.append("\n")
-
-        # Analyze each workflow
-        report.append("## Workflow Analysis\n\n")
-        for workflow_name in global_stats.get('by_workflow', {}).keys():
-            analysis = self.analyze_workflow(workflow_name)
-
-            if 'error' in analysis:
-                continue
-
-            stats = analysis['statistics']
-            improvements = analysis['improvements']
-
-            report.append(f"### {workflow_name}\n\n")
-            report.append(f"- **Executions**: {stats['total_executions']}\n")
-            report.append(f"- **Success Rate**: {stats['success_rate']:.1%}\n")
-            report.append(f"- **Average Duration**: {self._format_duration(stats['avg_duration'])}\n")
-
-            if improvements:
-                report.append(f"\n**Recommendations ({len(improvements)}):**\n\n")
-                for improvement in improvements:
-                    report.append(f"- {improvement['recommendation']}\n")
-
-            report.append("\n")
-
-        # Detected patterns
+        analyses = self.analyze_workflows_bulk(list(global_stats.get('by_workflow', {})))
         patterns = self.detect_task_patterns(min_occurrences=2)
 
-        if patterns:
-            report.append("## Detected Task Patterns\n\n")
-            report.append("These patterns could become new workflow templates:\n\n")
-
-            for i, pattern in enumerate(patterns, 1):
-                report.append(f"### Pattern {i}: {pattern['keywords']}\n\n")
-                report.append(f"- **Occurrences**: {pattern['occurrences']}\n")
-                report.append(f"- **Success Rate**: {pattern['success_rate']:.1%}\n")
-                report.append(f"- **Agent Sequence**: {' → '.join(pattern['agent_sequence'])}\n")
-                report.append(f"- **Sample Tasks**:\n")
-                for task in pattern['sample_tasks']:
-                    report.append(f"  - {task}\n")
-                report.append("\n")
-
-        # Write report
-        output_file = self.base_dir / output_path
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
+        # Stream sections to a temporary file and swap it in once complete
+        tmp_file = output_file.with_name(output_file.name + '.tmp')
         try:
-            with open(output_file, 'w') as f:
-                f.write(''.join(report))
-
+            with open(tmp_file, 'w') as report:
+                report.write("# Workflow Learning Report\n")
+                report.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+                # Global statistics
+                report.write("## Global Statistics\n\n")
+                report.write(f"- **Total Executions**: {global_stats['total_executions']}\n")
+                report.write(f"- **Workflows Used**: {global_stats['workflows_used']}\n")
+                report.write(f"- **Overall Success Rate**: {global_stats['success_rate']:.1%}\n")
+                report.write(f"- **Average Duration**: {_format_duration(global_stats['avg_duration'])}\n\n")
+
+                # Most used workflows
+                if global_stats.get('most_used_workflows'):
+                    report.write("## Most Used Workflows\n\n")
+                    for name, count in global_stats['most_used_workflows']:
+                        report.write(f"1. **{name}**: {count} executions\n")
+                    report.write("\n")
+
+                # Analyze each workflow
+                report.write("## Workflow Analysis\n\n")
+                for workflow_name, analysis in analyses.items():
+                    if 'error' in analysis:
+                        continue
+
+                    stats = analysis['statistics']
+                    improvements = analysis['improvements']
+
+                    report.write(f"### {workflow_name}\n\n")
+                    report.write(f"- **Executions**: {stats['total_executions']}\n")
+                    report.write(f"- **Success Rate**: {stats['success_rate']:.1%}\n")
+                    report.write(f"- **Average Duration**: {_format_duration(stats['avg_duration'])}\n")
+
+                    if improvements:
+                        report.write(f"\n**Recommendations ({len(improvements)}):**\n\n")
+                        for improvement in improvements:
+                            report.write(f"- {improvement['recommendation']}\n")
+
+                    report.write("\n")
+
+                # Detected patterns
+                if patterns:
+                    report.write("## Detected Task Patterns\n\n")
+                    report.write("These patterns could become new workflow templates:\n\n")
+
+                    for i, pattern in enumerate(patterns, 1):
+                        report.write(f"### Pattern {i}: {pattern['keywords']}\n\n")
+                        report.write(f"- **Occurrences**: {pattern['occurrences']}\n")
+                        report.write(f"- **Success Rate**: {pattern['success_rate']:.1%}\n")
+                        report.write(f"- **Agent Sequence**: {' → '.join(pattern['agent_sequence'])}\n")
+                        report.write(f"- **Sample Tasks**:\n")
+                        for task in pattern['sample_tasks']:
+                            report.write(f"  - {task}\n")
+                        report.write("\n")
+
+            os.replace(tmp_file, output_file)
             print(f"✅ Learning report saved to: {output_file}")
             return str(output_file)
 
         except Exception as e:
             print(f"❌ Error saving learning report: {e}")
+            tmp_file.unlink(missing_ok=True)
             return ""
 
-    def _format_duration(self, seconds: float) -> str:
-        """Format duration in seconds to human-readable string."""
-        if seconds < 60:
-            return f"{seconds:.1f}s"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            secs = seconds % 60
-            return f"{minutes}m {secs:.0f}s"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
-
 
 if __name__ == "__main__":
     # Example usage
@@ -14,16 +14,24 @@ sys.path.insert(0, str(Path(__file__).parent))
 from calculator import Calculator
 
 
-class TestCalculator(unittest.TestCase):
-    """Test suite for Calculator class."""
+class SharedCalculatorMixin:
+    """Give each test class one Calculator, reset before every test as ``self.calc``."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one calculator shared by the tests in this class."""
+        super().setUpClass()
+        cls._calc = Calculator()
 
     def setUp(self):
         """Set up test fixtures."""
-        self.calc = Calculator()
+        super().setUp()
+        self.calc = self._calc
+        self.calc.reset()
 
-    def tearDown(self):
-        """Clean up after tests."""
-        self.calc = None
+
+class TestCalculator(SharedCalculatorMixin, unittest.TestCase):
+    """Test suite for Calculator class."""
 
     # Addition Tests
     def test_add_positive_numbers(self):
@@ -3,9 +3,22 @@
 Basic tests for the Multi-Agent Framework
 """
 import asyncio
+import contextlib
+import inspect
+import io
+import os
 import sys
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# pytest is only needed for its fixtures; run_all_tests() works without it
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -18,12 +31,28 @@ from agents import (
 )
 
 
-def test_agent_registry():
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop's event loop when it is installed."""
+    try:
+        from uvloop import run  # uvloop 0.18+; not available on Windows
+    except ImportError:
+        run = asyncio.run
+    return run(coro)
+
+
+if pytest is not None:
+    @pytest.fixture(scope="module")
+    def registry(tmp_path_factory):
+        """Agent registry built once and shared by the tests in this module"""
+        path = tmp_path_factory.mktemp("registry") / "registry.json"
+        yield AgentRegistry(str(path))
+        path.unlink(missing_ok=True)
+
+
+def test_agent_registry(registry):
     """Test agent registry functionality"""
     print("Testing Agent Registry...")
 
-    registry = AgentRegistry("agents/test_registry.json")
-
     # Check default agents loaded
     assert len(registry.agents) > 0, "No agents loaded"
     print(f"  ✅ Loaded {len(registry.agents)} agents")
@@ -38,17 +67,13 @@ def test_agent_registry():
     assert best is not None, "Could not find best agent"
     print(f"  ✅ Best agent for code review: {best.name}")
 
-    # Cleanup
-    Path("agents/test_registry.json").unlink(missing_ok=True)
-
     print("  ✅ Agent Registry tests passed\n")
 
 
-def test_task_router():
+def test_task_router(registry):
     """Test task routing functionality"""
     print("Testing Task Router...")
 
-    registry = AgentRegistry("agents/test_registry.json")
     router = TaskRouter(registry)
 
     # Test task analysis
@@ -72,9 +97,6 @@ def test_task_router():
     assert len(assignments) > 0, "No agents selected"
     print(f"  ✅ Selected {len(assignments)} agents")
 
-    # Cleanup
-    Path("agents/test_registry.json").unlink(missing_ok=True)
-
     print("  ✅ Task Router tests passed\n")
 
 
@@ -157,9 +179,9 @@ async def test_orchestrator_basic():
     print("Testing Orchestrator (basic)...")
 
     orchestrator = Orchestrator(
-        workspace_dir="workspace/test",
-        registry_path="agents/test_registry.json",
-        skills_path="agents/test_skills.json"
+        workspace_dir="workspace/test_orchestrator",
+        registry_path="agents/test_orchestrator_registry.json",
+        skills_path="agents/test_orchestrator_skills.json"
     )
 
     # Test system status
@@ -174,12 +196,37 @@ async def test_orchestrator_basic():
     print(f"  ✅ {len(agents)} agents available")
 
     # Cleanup
-    Path("agents/test_registry.json").unlink(missing_ok=True)
-    Path("agents/test_skills.json").unlink(missing_ok=True)
+    Path("agents/test_orchestrator_registry.json").unlink(missing_ok=True)
+    Path("agents/test_orchestrator_skills.json").unlink(missing_ok=True)
 
     print("  ✅ Orchestrator basic tests passed\n")
 
 
+def _run_one(test_name):
+    """Run a test function by name in a worker.
+
+    Returns its captured output and, if it failed, the traceback (None if it
+    passed), so results can be printed in order instead of interleaved.
+    """
+    test_func = globals()[test_name]
+    output = io.StringIO()
+    error = None
+    with tempfile.TemporaryDirectory() as tmp_dir, contextlib.redirect_stdout(output):
+        try:
+            # Outside pytest, build the registry fixture by hand
+            kwargs = {}
+            if 'registry' in inspect.signature(test_func).parameters:
+                kwargs['registry'] = AgentRegistry(str(Path(tmp_dir) / "registry.json"))
+
+            if inspect.iscoroutinefunction(test_func):
+                asyncio.run(test_func(**kwargs))
+            else:
+                test_func(**kwargs)
+        except Exception:
+            error = traceback.format_exc()
+    return output.getvalue(), error
+
+
 def run_all_tests():
     """Run all tests"""
     print("="*80)
@@ -187,23 +234,28 @@ def run_all_tests():
     print("="*80)
     print()
 
+    # Tests use separate files and workspaces, so they run in parallel
     tests = [
-        ("Agent Registry", test_agent_registry),
-        ("Task Router", test_task_router),
-        ("TMUX Manager", test_tmux_manager),
-        ("Skills System", test_skills_system),
-        ("Orchestrator", lambda: asyncio.run(test_orchestrator_basic()))
+        ("Agent Registry", "test_agent_registry"),
+        ("Task Router", "test_task_router"),
+        ("TMUX Manager", "test_tmux_manager"),
+        ("Skills System", "test_skills_system"),
+        ("Orchestrator", "test_orchestrator_basic")
     ]
 
+    with ProcessPoolExecutor(max_workers=min(len(tests), os.cpu_count() or 1)) as pool:
+        results = list(pool.map(_run_one, [test_name for _, test_name in tests]))
+
     passed = 0
     failed = 0
 
-    for name, test_func in tests:
-        try:
-            test_func()
+    # Print each test's output in declared order
+    for (name, _), (output, error) in zip(tests, results):
+        print(output, end="")
+        if error is None:
             passed += 1
-        except Exception as e:
-            print(f"  ❌ {name} test failed: {e}\n")
+        else:
+            print(f"  ❌ {name} test failed:\n{error}")
             failed += 1
 
     print("="*80)
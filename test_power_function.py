@@ -4,6 +4,7 @@ Power Function Comprehensive Test Suite
 Agent: tester
 Task: Thorough validation of power() function implementation
 """
+import io
 import unittest
 import sys
 import math
@@ -13,95 +14,54 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from calculator import Calculator
+from test_calculator import SharedCalculatorMixin
 
 
-class TestPowerBasicFunctionality(unittest.TestCase):
+class TestPowerBasicFunctionality(SharedCalculatorMixin, unittest.TestCase):
     """Test basic power function operations."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = Calculator()
-
-    def test_power_positive_integers(self):
-        """Test power with positive integers."""
-        result = self.calc.power(2, 3)
-        self.assertEqual(result, 8)
-
-    def test_power_positive_base_higher_exponent(self):
-        """Test power with larger exponent."""
-        result = self.calc.power(2, 8)
-        self.assertEqual(result, 256)
-
-    def test_power_base_10(self):
-        """Test power with base 10."""
-        result = self.calc.power(10, 3)
-        self.assertEqual(result, 1000)
-
-    def test_power_float_base(self):
-        """Test power with float base."""
-        result = self.calc.power(2.5, 2)
-        self.assertEqual(result, 6.25)
-
-    def test_power_float_exponent(self):
-        """Test power with float exponent."""
-        result = self.calc.power(4, 0.5)
-        self.assertEqual(result, 2.0)
-
-    def test_power_both_floats(self):
-        """Test power with both float arguments."""
-        result = self.calc.power(2.5, 1.5)
-        self.assertAlmostEqual(result, 3.952847075210474, places=10)
-
-
-class TestPowerEdgeCases(unittest.TestCase):
+    # (base, exponent, expected, decimal places to compare; None for exact)
+    CASES = [
+        (2, 3, 8, None),                    # positive integers
+        (2, 8, 256, None),                  # larger exponent
+        (10, 3, 1000, None),                # base 10
+        (2.5, 2, 6.25, None),               # float base
+        (4, 0.5, 2.0, None),                # float exponent
+        (2.5, 1.5, 3.952847075210474, 10),  # both floats
+    ]
+
+    def test_power(self):
+        """Test power across integer and float arguments."""
+        for base, exponent, expected, places in self.CASES:
+            with self.subTest(base=base, exponent=exponent):
+                if places is None:
+                    self.assertEqual(self.calc.power(base, exponent), expected)
+                else:
+                    self.assertAlmostEqual(self.calc.power(base, exponent), expected, places=places)
+
+
+class TestPowerEdgeCases(SharedCalculatorMixin, unittest.TestCase):
     """Test edge cases for power function."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = Calculator()
-
-    def test_power_zero_exponent(self):
-        """Test any number to the power of 0 equals 1."""
-        result = self.calc.power(5, 0)
-        self.assertEqual(result, 1)
-
-        result = self.calc.power(100, 0)
-        self.assertEqual(result, 1)
-
-        result = self.calc.power(-5, 0)
-        self.assertEqual(result, 1)
-
-    def test_power_one_exponent(self):
-        """Test any number to the power of 1 equals itself."""
-        result = self.calc.power(7, 1)
-        self.assertEqual(result, 7)
-
-        result = self.calc.power(-7, 1)
-        self.assertEqual(result, -7)
-
-    def test_power_one_base(self):
-        """Test 1 to any power equals 1."""
-        result = self.calc.power(1, 5)
-        self.assertEqual(result, 1)
-
-        result = self.calc.power(1, 100)
-        self.assertEqual(result, 1)
-
-    def test_power_negative_base_positive_exponent(self):
-        """Test negative base with positive integer exponent."""
-        result = self.calc.power(-2, 3)
-        self.assertEqual(result, -8)
-
-        result = self.calc.power(-2, 4)
-        self.assertEqual(result, 16)
-
-    def test_power_negative_exponent(self):
-        """Test power with negative exponent."""
-        result = self.calc.power(2, -1)
-        self.assertEqual(result, 0.5)
-
-        result = self.calc.power(2, -3)
-        self.assertEqual(result, 0.125)
+    # (base, exponent, expected)
+    CASES = [
+        # Any number to the power of 0 equals 1
+        (5, 0, 1), (100, 0, 1), (-5, 0, 1),
+        # Any number to the power of 1 equals itself
+        (7, 1, 7), (-7, 1, -7),
+        # 1 to any power equals 1
+        (1, 5, 1), (1, 100, 1),
+        # Negative base with positive integer exponent
+        (-2, 3, -8), (-2, 4, 16),
+        # Negative exponent
+        (2, -1, 0.5), (2, -3, 0.125),
+    ]
+
+    def test_power_edge_values(self):
+        """Test zero, one and negative exponents and bases."""
+        for base, exponent, expected in self.CASES:
+            with self.subTest(base=base, exponent=exponent):
+                self.assertEqual(self.calc.power(base, exponent), expected)
 
     def test_power_zero_base_positive_exponent(self):
         """Test 0 to a positive power equals 0."""
@@ -123,13 +83,9 @@ class TestPowerEdgeCases(unittest.TestCase):
         self.assertIn("undefined", str(context.exception).lower())
 
 
-class TestPowerSpecialCases(unittest.TestCase):
+class TestPowerSpecialCases(SharedCalculatorMixin, unittest.TestCase):
     """Test special mathematical cases for power function."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = Calculator()
-
     def test_power_negative_base_fractional_exponent(self):
         """Test negative base with fractional exponent results in complex number."""
         # Python's ** operator returns complex numbers for negative base with fractional exponent
@@ -162,46 +118,28 @@ class TestPowerSpecialCases(unittest.TestCase):
         self.assertEqual(result, 1e-10)
 
 
-class TestPowerErrorHandling(unittest.TestCase):
+class TestPowerErrorHandling(SharedCalculatorMixin, unittest.TestCase):
     """Test error handling for power function."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = Calculator()
-
-    def test_power_invalid_base_string(self):
-        """Test that string base raises TypeError."""
-        with self.assertRaises(TypeError):
-            self.calc.power("2", 3)
-
-    def test_power_invalid_exponent_string(self):
-        """Test that string exponent raises TypeError."""
-        with self.assertRaises(TypeError):
-            self.calc.power(2, "3")
-
-    def test_power_invalid_base_list(self):
-        """Test that list base raises TypeError."""
-        with self.assertRaises(TypeError):
-            self.calc.power([2], 3)
-
-    def test_power_invalid_exponent_none(self):
-        """Test that None exponent raises TypeError."""
-        with self.assertRaises(TypeError):
-            self.calc.power(2, None)
+    # (base, exponent) pairs that are not both numeric
+    INVALID_ARGS = [
+        ("2", 3),      # string base
+        (2, "3"),      # string exponent
+        ([2], 3),      # list base
+        (2, None),     # None exponent
+        ("2", "3"),    # both invalid
+    ]
 
-    def test_power_invalid_both_arguments(self):
-        """Test that invalid arguments for both raise TypeError."""
-        with self.assertRaises(TypeError):
-            self.calc.power("2", "3")
+    def test_power_invalid_args(self):
+        """Test that non-numeric arguments raise TypeError."""
+        for base, exponent in self.INVALID_ARGS:
+            with self.subTest(base=base, exponent=exponent), self.assertRaises(TypeError):
+                self.calc.power(base, exponent)
 
 
-class TestPowerStateManagement(unittest.TestCase):
+class TestPowerStateManagement(SharedCalculatorMixin, unittest.TestCase):
     """Test state management integration for power function."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.calc = Calculator()
-
     def test_power_updates_last_result(self):
         """Test that power operation updates last_result."""
         result = self.calc.power(3, 4)
@@ -218,7 +156,7 @@ class TestPowerStateManagement(unittest.TestCase):
         self.calc.power(2, 2)
         self.calc.power(3, 3)
         self.calc.power(4, 4)
-        self.assertEqual(self.calc.get_operation_count(), 3)
+        self.assertEqual(self.calc.operation_count, 3)
 
     def test_power_with_other_operations(self):
         """Test power operation mixed with other operations."""
@@ -226,24 +164,24 @@ class TestPowerStateManagement(unittest.TestCase):
         self.calc.power(2, 3)
         self.calc.multiply(3, 4)
 
-        self.assertEqual(self.calc.get_operation_count(), 3)
-        self.assertEqual(self.calc.get_last_result(), 12)
+        self.assertEqual(self.calc.operation_count, 3)
+        self.assertEqual(self.calc.last_result, 12)
 
     def test_power_chained_with_last_result(self):
         """Test using power with last_result from previous operation."""
         self.calc.add(2, 2)  # 4
-        last = self.calc.get_last_result()
+        last = self.calc.last_result
 
         self.calc.power(last, 3)  # 4^3 = 64
-        self.assertEqual(self.calc.get_last_result(), 64)
+        self.assertEqual(self.calc.last_result, 64)
 
     def test_power_reset_clears_state(self):
         """Test that reset clears state after power operation."""
         self.calc.power(5, 2)
         self.calc.reset()
 
-        self.assertIsNone(self.calc.get_last_result())
-        self.assertEqual(self.calc.get_operation_count(), 0)
+        self.assertIsNone(self.calc.last_result)
+        self.assertEqual(self.calc.operation_count, 0)
 
 
 class TestPowerIntegration(unittest.TestCase):
@@ -259,7 +197,7 @@ class TestPowerIntegration(unittest.TestCase):
         result3 = calc.multiply(result2, 2)  # 26
 
         self.assertEqual(result3, 26)
-        self.assertEqual(calc.get_operation_count(), 3)
+        self.assertEqual(calc.operation_count, 3)
 
     def test_power_with_division(self):
         """Test power combined with division."""
@@ -275,64 +213,70 @@ class TestPowerIntegration(unittest.TestCase):
 
 def run_power_tests():
     """Run the power function test suite and display results."""
-    print("\n" + "="*70)
-    print("POWER FUNCTION COMPREHENSIVE TEST SUITE")
-    print("Agent: tester")
-    print("Task: Thorough validation of power() function implementation")
-    print("="*70 + "\n")
-
-    # Create test suite
+    rule = "="*70
+    out = [
+        "\n" + rule,
+        "POWER FUNCTION COMPREHENSIVE TEST SUITE",
+        "Agent: tester",
+        "Task: Thorough validation of power() function implementation",
+        rule + "\n",
+    ]
+
+    # Load all test classes in this module
     loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestPowerBasicFunctionality))
-    suite.addTests(loader.loadTestsFromTestCase(TestPowerEdgeCases))
-    suite.addTests(loader.loadTestsFromTestCase(TestPowerSpecialCases))
-    suite.addTests(loader.loadTestsFromTestCase(TestPowerErrorHandling))
-    suite.addTests(loader.loadTestsFromTestCase(TestPowerStateManagement))
-    suite.addTests(loader.loadTestsFromTestCase(TestPowerIntegration))
-
-    # Run tests with verbose output
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
 
-    # Print summary
-    print("\n" + "="*70)
-    print("POWER FUNCTION TEST SUMMARY")
-    print("="*70)
-    print(f"Total Tests Run: {result.testsRun}")
-    print(f"Passed: {result.testsRun - len(result.failures) - len(result.errors)}")
-    print(f"Failed: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
+    # Runner output is buffered and emitted with the summary in a single write
+    stream = io.StringIO()
+    runner = unittest.TextTestRunner(stream=stream, verbosity=2)
+    result = runner.run(suite)
+    out.append(stream.getvalue())
+
+    # Summary
+    out += [
+        "\n" + rule,
+        "POWER FUNCTION TEST SUMMARY",
+        rule,
+        f"Total Tests Run: {result.testsRun}",
+        f"Passed: {result.testsRun - len(result.failures) - len(result.errors)}",
+        f"Failed: {len(result.failures)}",
+        f"Errors: {len(result.errors)}",
+    ]
 
     # Show failures and errors
-    if result.failures:
-        print("\n" + "-"*70)
-        print("FAILURES:")
-        print("-"*70)
-        for test, traceback in result.failures:
-            print(f"\n{test}:")
-            print(traceback)
-
-    if result.errors:
-        print("\n" + "-"*70)
-        print("ERRORS:")
-        print("-"*70)
-        for test, traceback in result.errors:
-            print(f"\n{test}:")
-            print(traceback)
+    for title, problems in (("FAILURES", result.failures), ("ERRORS", result.errors)):
+        if problems:
+            out += ["\n" + "-"*70, f"{title}:", "-"*70]
+            for test, traceback in problems:
+                out += [f"\n{test}:", traceback]
 
     if result.wasSuccessful():
-        print("\nStatus: ALL TESTS PASSED")
+        out.append("\nStatus: ALL TESTS PASSED")
     else:
-        print("\nStatus: SOME TESTS FAILED")
+        out.append("\nStatus: SOME TESTS FAILED")
 
-    print("="*70 + "\n")
+    out.append(rule + "\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
     return result
 
 
+def _pytest_args():
+    """Arguments for running this file under pytest, in parallel when pytest-xdist is installed."""
+    args = [__file__, "-q", "--durations=10"]
+    try:
+        import xdist  # noqa: F401
+        args += ["-n", "auto"]
+    except ImportError:
+        pass
+    return args
+
+
 if __name__ == "__main__":
-    result = run_power_tests()
-    sys.exit(0 if result.wasSuccessful() else 1)
+    try:
+        import pytest
+    except ImportError:
+        result = run_power_tests()
+        sys.exit(0 if result.wasSuccessful() else 1)
+
+    sys.exit(pytest.main(_pytest_args()))
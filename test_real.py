@@ -4,6 +4,7 @@ Real system test - creates delegation plan
 """
 import asyncio
 from agents import OrchestratorV2
+from test_framework import run_async
 
 async def main():
     orchestrator = OrchestratorV2()
@@ -51,4 +52,4 @@ async def main():
     return result
 
 if __name__ == "__main__":
-    result = asyncio.run(main())
+    result = run_async(main())
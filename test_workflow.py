@@ -5,6 +5,7 @@ Demonstrates real agent collaboration
 """
 import asyncio
 from agents import OrchestratorV2
+from test_framework import run_async
 
 async def main():
     orchestrator = OrchestratorV2()
@@ -52,7 +53,7 @@ async def main():
         return None
 
 if __name__ == "__main__":
-    plan = asyncio.run(main())
+    plan = run_async(main())
 
     if plan:
         print("\n📝 Next: Execute each agent using Claude Code's Task tool")
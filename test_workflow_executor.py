@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Workflow Executor Tests
+Covers step ordering, template checks, hooks, quality gates and output validation
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+
+import yaml
+
+# Add system directory to path
+sys.path.insert(0, str(Path(__file__).parent / "system"))
+
+from graphlib import CycleError
+from workflow_executor import WorkflowExecutor, WorkflowStep, _count_lines_atleast
+
+
+def _step(step_id: str, depends_on=(), **extra) -> dict:
+    """Step dict as written in a workflow template."""
+    return dict({'id': step_id, 'name': step_id.title(), 'agent': 'code_writer',
+                 'depends_on': list(depends_on)}, **extra)
+
+
+class ReliableExecutor(WorkflowExecutor):
+    """Executor whose simulated steps always succeed."""
+
+    def _simulate_step_execution(self, step):
+        return {'success': True, 'outputs': list(step.outputs)}
+
+
+class TestWorkflowExecution(unittest.TestCase):
+    """Test executing workflow templates end to end."""
+
+    def setUp(self):
+        """Set up a fresh workflows directory."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base_dir = self._tmp.name
+        self.executor = ReliableExecutor(self.base_dir)
+
+    def tearDown(self):
+        """Remove the workflows directory."""
+        self._tmp.cleanup()
+
+    def _write_workflow(self, name: str, steps: list, **extra):
+        """Write a workflow template into the templates directory."""
+        workflow = dict({'name': name, 'version': '1.0.0', 'steps': steps}, **extra)
+        path = Path(self.base_dir) / "workflows" / "templates" / f"{name}.yaml"
+        path.write_text(yaml.safe_dump(workflow))
+
+    def _execute(self, name: str) -> dict:
+        """Execute a workflow with its console output suppressed."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.executor.execute_workflow(name, "Build a weather app")
+
+    def test_steps_run_after_dependencies(self):
+        """Test that a step declared before its dependency runs after it."""
+        self._write_workflow("ordered", [
+            _step("implement", depends_on=["design"]),
+            _step("design"),
+            _step("review")
+        ])
+
+        result = self._execute("ordered")
+        self.assertTrue(result['success'])
+
+        execution = self.executor.history.get_execution_history("ordered")[0]
+        self.assertEqual([s.step_id for s in execution.steps], ["design", "implement", "review"])
+
+    def test_declared_order_kept_without_dependencies(self):
+        """Test that independent steps keep their declared order."""
+        self._write_workflow("plain", [_step("c"), _step("a"), _step("b")])
+
+        self._execute("plain")
+
+        execution = self.executor.history.get_execution_history("plain")[0]
+        self.assertEqual([s.step_id for s in execution.steps], ["c", "a", "b"])
+
+    def test_circular_dependencies_rejected(self):
+        """Test that a dependency cycle stops the workflow before it starts."""
+        self._write_workflow("cyclic", [
+            _step("a", depends_on=["b"]),
+            _step("b", depends_on=["a"])
+        ])
+
+        result = self._execute("cyclic")
+        self.assertFalse(result['success'])
+        self.assertIn("circular step dependencies", result['error'])
+        self.assertEqual(self.executor.history.get_execution_history("cyclic"), [])
+
+    def test_duplicate_step_ids_rejected(self):
+        """Test that duplicate step ids stop the workflow before it starts."""
+        self._write_workflow("duplicated", [_step("a"), _step("a")])
+
+        result = self._execute("duplicated")
+        self.assertFalse(result['success'])
+        self.assertIn("duplicate step ids", result['error'])
+
+    def test_unknown_workflow(self):
+        """Test that a missing workflow reports an error."""
+        result = self._execute("missing")
+        self.assertFalse(result['success'])
+        self.assertIn("not found", result['error'])
+
+    def test_order_steps_raises_cycle_error(self):
+        """Test that _order_steps raises CycleError for circular dependencies."""
+        steps = {s.id: s for s in (WorkflowStep.from_dict(_step("a", depends_on=["b"])),
+                                   WorkflowStep.from_dict(_step("b", depends_on=["a"])))}
+        with self.assertRaises(CycleError):
+            self.executor._order_steps(steps)
+
+    def test_unknown_dependencies_ignored(self):
+        """Test that dependencies on undeclared steps do not block ordering."""
+        steps = {s.id: s for s in (WorkflowStep.from_dict(_step("a", depends_on=["ghost"])),
+                                   WorkflowStep.from_dict(_step("b")))}
+        self.assertEqual([s.id for s in self.executor._order_steps(steps)], ["a", "b"])
+
+
+class TestHooksAndGates(unittest.TestCase):
+    """Test hook batching and manual quality gates."""
+
+    def setUp(self):
+        """Set up an executor on a temporary directory."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.executor = WorkflowExecutor(self._tmp.name)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self._tmp.cleanup()
+
+    def test_sequential_hook_splits_batches(self):
+        """Test that a sequential hook runs alone between the hooks around it."""
+        batches = []
+        self.executor._run_hook_batch = lambda hooks: batches.append([h['action'] for h in hooks])
+
+        self.executor._execute_hooks((
+            {'action': 'a'}, {'action': 'b'},
+            {'action': 'c', 'sequential': True},
+            {'action': 'd'}
+        ))
+
+        self.assertEqual([batch for batch in batches if batch], [['a', 'b'], ['c'], ['d']])
+
+    def test_hook_output_in_declared_order(self):
+        """Test that concurrently run hooks are reported in declared order."""
+        hooks = tuple({'action': f'hook{i}'} for i in range(6))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.executor._execute_hooks(hooks)
+
+        self.assertEqual(output.getvalue().splitlines(),
+                         [f"🪝 Hook: hook{i}" for i in range(6)])
+
+    def test_manual_gate_bool_approval(self):
+        """Test that a boolean approval decides a manual gate."""
+        self.executor.approval_fn = lambda gate: gate['name'] == 'ok'
+        self.assertTrue(self.executor._check_quality_gate({'name': 'ok', 'type': 'manual'}))
+        self.assertFalse(self.executor._check_quality_gate({'name': 'no', 'type': 'manual'}))
+
+    def test_manual_gate_future_approval(self):
+        """Test that a resolved Future decides a manual gate."""
+        future = Future()
+        future.set_result(True)
+        self.executor.approval_fn = lambda gate: future
+        self.assertTrue(self.executor._check_quality_gate({'name': 'gate', 'type': 'manual'}))
+
+    def test_manual_gate_timeout_fails(self):
+        """Test that a manual gate fails when its approval times out."""
+        self.executor.approval_fn = lambda gate: Future()  # never resolved
+        gate = {'name': 'slow', 'type': 'manual', 'timeout': 0.01}
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertFalse(self.executor._check_quality_gate(gate))
+        self.assertIn("timed out", output.getvalue())
+
+
+class TestOutputValidation(unittest.TestCase):
+    """Test validation rules and the file scanners behind them."""
+
+    def setUp(self):
+        """Set up a workspace directory."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.workspace = Path(self._tmp.name)
+        self.executor = WorkflowExecutor(self._tmp.name)
+
+    def tearDown(self):
+        """Remove the workspace directory."""
+        self._tmp.cleanup()
+
+    def test_count_lines_matches_full_count(self):
+        """Test that the early-exit line counter agrees with a full count."""
+        cases = ["", "one", "one\n", "a\nb\nc", "a\nb\nc\n", "\n\n\n", "x\n" * 1000 + "tail"]
+        for content in cases:
+            with self.subTest(content=content[:20]):
+                path = self.workspace / "lines.txt"
+                path.write_text(content)
+                expected = len(content.splitlines())
+                self.assertEqual(_count_lines_atleast(path, 10**9, chunk_size=7), expected)
+
+    def test_count_lines_stops_at_limit(self):
+        """Test that counting stops once the limit is reached."""
+        path = self.workspace / "lines.txt"
+        path.write_text("x\n" * 1000)
+        count = _count_lines_atleast(path, 10, chunk_size=16)
+        self.assertGreaterEqual(count, 10)
+        self.assertLess(count, 1000)
+
+    def test_html_syntax(self):
+        """Test HTML structure checks."""
+        cases = [
+            ("<!DOCTYPE html><html><body></body></html>", True),
+            ("<!doctype html><html><body></body></html>", True),
+            ("<html><body></body></html>", False),                   # no doctype
+            ("<!DOCTYPE html><html><body></body>", False),           # unbalanced
+            ("<!DOCTYPE html><html></html>", False),                 # no body
+            ("<!DOCTYPE html><HTML><BODY></BODY></HTML>", False),    # tags are case-sensitive
+        ]
+        for content, expected in cases:
+            with self.subTest(content=content):
+                path = self.workspace / "index.html"
+                path.write_text(content)
+                self.assertEqual(self.executor._validate_html_syntax(path), expected)
+
+    def test_rules_compiled_once(self):
+        """Test that rules are resolved once per step and unknown types are ignored."""
+        step = WorkflowStep.from_dict(_step("build", validation=[
+            {'type': 'output_exists', 'file': 'index.html'},
+            {'type': 'no_such_rule'}
+        ]))
+
+        compiled = self.executor._compile_rules(step)
+        self.assertEqual(len(compiled), 1)
+        self.assertIs(self.executor._compile_rules(step), compiled)
+
+    def test_validate_outputs(self):
+        """Test output_exists, min_lines and custom rules against a workspace."""
+        (self.workspace / "index.html").write_text("line\n" * 3)
+        (self.workspace / "QA_REPORT.md").write_text("2 tests FAILED")
+        step = WorkflowStep.from_dict(_step("build", validation=[
+            {'type': 'output_exists', 'file': 'index.html'},
+            {'type': 'output_exists', 'file': 'app.js', 'allow_alternatives': True,
+             'alternatives': ['main.js']},
+            {'type': 'min_lines', 'file': 'index.html', 'value': 5},
+            {'type': 'min_lines', 'file': 'missing.txt', 'value': 5, 'skip_if_missing': True},
+            {'type': 'custom', 'check': 'all_tests_pass'}
+        ]))
+
+        result = self.executor._validate_step_outputs(step, [], self.workspace)
+
+        self.assertFalse(result['passed'])
+        self.assertEqual(result['errors'], [
+            "Expected output file not found. Tried: 'app.js', 'main.js'",
+            "File 'index.html' has 3 lines, expected at least 5",
+            "QA testing found issues - check QA_REPORT.md"
+        ])
+
+    def test_validate_outputs_accepts_step_dict(self):
+        """Test that a raw template step dict is validated like a parsed step."""
+        (self.workspace / "data.json").write_text('{"ok": true}')
+        step = _step("build", validation=[{'type': 'syntax_valid', 'language': 'json',
+                                           'file': 'data.json'}])
+
+        result = self.executor._validate_step_outputs(step, [], self.workspace)
+        self.assertEqual(result, {'passed': True, 'errors': []})
+
+
+if __name__ == "__main__":
+    unittest.main()
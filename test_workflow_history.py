@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Workflow History Storage Tests
+Covers the JSONL day-log format and reading of legacy per-execution .json files
+"""
+import importlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project and system directories to path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent / "system"))
+
+import workflow_history
+from workflow_history import WorkflowHistory
+
+
+def _legacy_execution(execution_id: str, workflow_name: str) -> dict:
+    """Execution dict as written by the old one-file-per-execution format."""
+    return {
+        'execution_id': execution_id,
+        'workflow_name': workflow_name,
+        'workflow_version': '1.0.0',
+        'task_description': 'Legacy task',
+        'status': 'completed',
+        'start_time': '2025-01-17T10:00:00',
+        'end_time': '2025-01-17T10:05:00',
+        'duration': 300.0,
+        'steps': [{
+            'step_id': 'design',
+            'step_name': 'Create Design',
+            'agent': 'designer',
+            'status': 'completed',
+            'start_time': '2025-01-17T10:00:00',
+            'end_time': '2025-01-17T10:05:00',
+            'duration': 300.0,
+            'outputs': ['DESIGN.md'],
+            'validation_passed': True,
+            'validation_errors': [],
+            'error_message': None
+        }],
+        'total_steps': 1,
+        'completed_steps': 1,
+        'failed_steps': 0,
+        'skipped_steps': 0,
+        'quality_gates_passed': [],
+        'quality_gates_failed': [],
+        'user_interventions': 0,
+        'outputs_generated': ['DESIGN.md'],
+        'project_path': None
+    }
+
+
+class TestWorkflowHistoryStorage(unittest.TestCase):
+    """Test how executions are written to and read back from disk."""
+
+    def setUp(self):
+        """Set up a fresh history directory."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.base_dir = self._tmp.name
+        self.history = WorkflowHistory(self.base_dir)
+
+    def tearDown(self):
+        """Remove the history directory."""
+        self._tmp.cleanup()
+
+    def _run_execution(self, history: WorkflowHistory, workflow_name: str = "web-app") -> str:
+        """Record a one-step execution and return its id."""
+        exec_id = history.start_execution(workflow_name, "1.0.0", "Build a weather app")
+        history.start_step(exec_id, "design", "Create Design", "designer")
+        history.complete_step(exec_id, "design", outputs=["DESIGN.md"])
+        history.complete_execution(exec_id, success=True)
+        return exec_id
+
+    def test_execution_appended_to_day_log(self):
+        """Test that each execution is one JSON line in its workflow's day log."""
+        first = self._run_execution(self.history)
+        second = self._run_execution(self.history)
+
+        logs = list((self.history.history_dir / "web-app").glob("*.jsonl"))
+        self.assertEqual(len(logs), 1)
+        self.assertRegex(logs[0].name, r"^\d{4}-\d{2}-\d{2}\.jsonl$")
+
+        lines = logs[0].read_text().splitlines()
+        self.assertEqual([json.loads(line)['execution_id'] for line in lines], [first, second])
+
+    def test_saved_execution_visible_to_other_instances(self):
+        """Test that a save is on disk as soon as complete_execution returns."""
+        reader = WorkflowHistory(self.base_dir)
+        self.assertEqual(reader.get_execution_history("web-app"), [])
+
+        exec_id = self._run_execution(self.history)
+        history = WorkflowHistory(self.base_dir).get_execution_history("web-app")
+        self.assertEqual([e.execution_id for e in history], [exec_id])
+
+        # An instance that already queried picks up later saves too
+        self._run_execution(self.history)
+        self.assertEqual(len(reader.get_execution_history("web-app")), 2)
+
+    def test_saved_execution_visible_across_module_copies(self):
+        """Test a save through system.workflow_history is seen via workflow_history."""
+        # The orchestrator imports system.workflow_history while the learner
+        # imports workflow_history, giving two separate module objects
+        writer = importlib.import_module("system.workflow_history").WorkflowHistory(self.base_dir)
+        exec_id = self._run_execution(writer)
+
+        history = self.history.get_execution_history("web-app")
+        self.assertEqual([e.execution_id for e in history], [exec_id])
+
+    def test_history_newest_first(self):
+        """Test that history is returned newest execution first and honors the limit."""
+        ids = [self._run_execution(self.history) for _ in range(3)]
+
+        history = self.history.get_execution_history("web-app")
+        self.assertEqual([e.execution_id for e in history], ids[::-1])
+
+        limited = self.history.get_execution_history("web-app", limit=2)
+        self.assertEqual([e.execution_id for e in limited], ids[:0:-1])
+
+    def test_iteration_reads_one_day_at_a_time(self):
+        """Test that iterating stops reading once the newest days cover the limit."""
+        workflow_dir = self.history.history_dir / "web-app"
+        workflow_dir.mkdir()
+        for day, execution_ids in (("2025-01-16", ["20250116_090000_000000"]),
+                                   ("2025-01-17", ["20250117_090000_000000",
+                                                   "20250117_100000_000000"])):
+            with open(workflow_dir / f"{day}.jsonl", 'w') as log:
+                for execution_id in execution_ids:
+                    log.write(json.dumps(_legacy_execution(execution_id, "web-app")) + "\n")
+
+        history = self.history.iter_execution_history("web-app", limit=2)
+        self.assertEqual([e.execution_id for e in history],
+                         ["20250117_100000_000000", "20250117_090000_000000"])
+        self.assertNotIn(str(workflow_dir / "2025-01-16.jsonl"),
+                         workflow_history._history_file_cache)
+
+        history = self.history.get_execution_history("web-app", limit=3)
+        self.assertEqual(history[-1].execution_id, "20250116_090000_000000")
+
+    def test_round_trip_preserves_fields(self):
+        """Test that a reloaded execution matches what was recorded."""
+        exec_id = self._run_execution(self.history)
+
+        execution = self.history.get_execution_history("web-app")[0]
+        self.assertEqual(execution.execution_id, exec_id)
+        self.assertEqual(execution.status, "completed")
+        self.assertEqual(execution.outputs_generated, ["DESIGN.md"])
+        self.assertEqual(len(execution.steps), 1)
+        self.assertEqual(execution.steps[0].agent, "designer")
+        self.assertEqual(execution.steps[0].outputs, ["DESIGN.md"])
+
+    def test_malformed_log_line_skipped(self):
+        """Test that a corrupt line in a day log does not hide the other executions."""
+        exec_id = self._run_execution(self.history)
+        log = next((self.history.history_dir / "web-app").glob("*.jsonl"))
+        with open(log, 'a') as f:
+            f.write("{not json\n")
+
+        history = self.history.get_execution_history("web-app")
+        self.assertEqual([e.execution_id for e in history], [exec_id])
+
+    def test_legacy_root_json_read(self):
+        """Test that flat {date}_{workflow}_{id}.json files are still read."""
+        legacy = _legacy_execution("20250117_100000_000000", "web-app")
+        path = self.history.history_dir / "2025-01-17_web-app_20250117_100000_000000.json"
+        path.write_text(json.dumps(legacy))
+
+        exec_id = self._run_execution(self.history)
+
+        history = self.history.get_execution_history("web-app")
+        self.assertEqual([e.execution_id for e in history], [exec_id, legacy['execution_id']])
+        self.assertEqual(history[1].steps[0].step_id, "design")
+
+        # Other workflows' legacy files are not included
+        self.assertEqual(self.history.get_execution_history("other"), [])
+
+    def test_changed_file_reloaded(self):
+        """Test that a day log rewritten in place is re-read rather than served stale."""
+        self._run_execution(self.history)
+        log = next((self.history.history_dir / "web-app").glob("*.jsonl"))
+        self.assertEqual(len(self.history.get_execution_history("web-app")), 1)
+
+        os.truncate(log, 0)
+        self.assertEqual(self.history.get_execution_history("web-app"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
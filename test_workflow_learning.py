@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Workflow Learning Tests
+Covers keyword extraction, cached analyses and task patterns, and saving learned workflows
+"""
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import yaml
+
+# Add system directory to path
+sys.path.insert(0, str(Path(__file__).parent / "system"))
+
+from workflow_learning import WorkflowLearner
+
+
+def _execution(execution_id: str, workflow_name: str = "web-app",
+               task: str = "Build a weather app", status: str = "completed") -> dict:
+    """Execution dict as stored in a day log."""
+    return {
+        'execution_id': execution_id,
+        'workflow_name': workflow_name,
+        'workflow_version': '1.0.0',
+        'task_description': task,
+        'status': status,
+        'start_time': '2025-01-17T10:00:00',
+        'duration': 60.0,
+        'steps': [{
+            'step_id': 'design',
+            'step_name': 'Create Design',
+            'agent': 'designer',
+            'status': 'completed' if status == 'completed' else 'failed',
+            'start_time': '2025-01-17T10:00:00',
+            'duration': 60.0
+        }]
+    }
+
+
+def _execution_id(second: int) -> str:
+    """Execution id for an execution started ``second`` seconds after 10:00 on 2025-01-17."""
+    return f"20250117_{10 + second // 3600:02d}{second // 60 % 60:02d}{second % 60:02d}_000000"
+
+
+class TestWorkflowLearner(unittest.TestCase):
+    """Test workflow analyses against a history written to disk."""
+
+    def setUp(self):
+        """Set up a fresh history directory."""
+        self._tmp = tempfile.TemporaryDirectory()
+        self.learner = WorkflowLearner(self._tmp.name)
+
+    def tearDown(self):
+        """Remove the history directory."""
+        self._tmp.cleanup()
+
+    def _save(self, *executions: dict, day: str = "2025-01-17"):
+        """Append executions to their workflow's day log, in the given order."""
+        for execution in executions:
+            log = self.learner.history.history_dir / execution['workflow_name'] / f"{day}.jsonl"
+            log.parent.mkdir(parents=True, exist_ok=True)
+            with open(log, 'a') as f:
+                f.write(json.dumps(execution) + "\n")
+
+    def test_analysis_reused_while_history_unchanged(self):
+        """Test that an unchanged history returns the cached analysis."""
+        self._save(_execution(_execution_id(0)))
+
+        first = self.learner.analyze_workflow("web-app")
+        self.assertIs(self.learner.analyze_workflow("web-app"), first)
+
+        self._save(_execution(_execution_id(1), status="failed"))
+        second = self.learner.analyze_workflow("web-app")
+        self.assertEqual(second['statistics']['total_executions'], 2)
+
+    def test_analysis_refreshed_when_full_window_changes_inside(self):
+        """Test an older-started execution completing into a full window is not served stale."""
+        # Window is the newest 100; every other second is left free
+        self._save(*(_execution(_execution_id(2 * i)) for i in range(101)))
+        before = self.learner.analyze_workflow("web-app")
+        self.assertEqual(before['statistics']['failed'], 0)
+
+        # Started before the newest execution, finished after it: the window
+        # keeps its size and its newest id but its contents change
+        self._save(_execution(_execution_id(101), status="failed"))
+        after = self.learner.analyze_workflow("web-app")
+        self.assertEqual(after['statistics']['total_executions'], 100)
+        self.assertEqual(after['statistics']['failed'], 1)
+
+    def test_bulk_analysis_matches_single(self):
+        """Test that bulk analysis matches analyzing each workflow on its own."""
+        self._save(_execution(_execution_id(0), "web-app"),
+                   _execution(_execution_id(1), "docs", status="failed"),
+                   _execution(_execution_id(2), "web-app", status="partial"))
+        self._save(_execution(_execution_id(3), "docs"), day="2025-01-18")
+
+        names = ["web-app", "docs", "unused"]
+        bulk = self.learner.analyze_workflows_bulk(names)
+        single = {name: WorkflowLearner(self._tmp.name).analyze_workflow(name) for name in names}
+
+        self.assertEqual(bulk, single)
+        self.assertEqual(bulk['docs']['statistics']['total_executions'], 2)
+        self.assertIn('error', bulk['unused'])
+
+    def test_keywords_keep_non_ascii_words(self):
+        """Test that accented and non-Latin words are kept whole as keywords."""
+        self.assertEqual(self.learner._extract_keywords("Créer une Änderung für São Paulo"),
+                         ["créer", "änderung", "paulo"])
+        self.assertEqual(self.learner._extract_keywords("Написать документацию, weather_app"),
+                         ["написать", "документацию", "weather"])
+
+    def _detect_patterns(self, learner: WorkflowLearner = None) -> list:
+        """Detect task patterns seen at least once."""
+        return (learner or self.learner).detect_task_patterns(min_occurrences=1)
+
+    def test_new_executions_merged_into_cached_patterns(self):
+        """Test that only executions newer than the cached groups are grouped again."""
+        self._save(_execution(_execution_id(0)),
+                   _execution(_execution_id(1), task="Write the API documentation"))
+        self._detect_patterns()
+
+        grouped = []
+        group_executions = self.learner._group_executions
+        self.learner._group_executions = lambda executions: (
+            grouped.append([e.execution_id for e in executions]) or group_executions(executions))
+
+        self._save(_execution(_execution_id(2), status="failed"))
+        patterns = self._detect_patterns()
+
+        self.assertEqual(grouped, [[_execution_id(2)]])
+        self.assertEqual(patterns, self._detect_patterns(WorkflowLearner(self._tmp.name)))
+        self.assertEqual(patterns[0]['occurrences'], 2)
+        self.assertEqual(patterns[0]['success_rate'], 0.5)
+
+    def test_overlapping_execution_counted_in_patterns(self):
+        """Test an execution that started before a counted one but finished after it is counted."""
+        self._save(_execution(_execution_id(10)))
+        self.assertEqual(self._detect_patterns()[0]['occurrences'], 1)
+
+        self._save(_execution(_execution_id(5), status="failed"))
+        patterns = self._detect_patterns()
+
+        self.assertEqual(patterns[0]['occurrences'], 2)
+        self.assertEqual(patterns, self._detect_patterns(WorkflowLearner(self._tmp.name)))
+
+    def test_patterns_regrouped_when_executions_leave_window(self):
+        """Test that executions pushed out of the window are no longer counted."""
+        self._save(*(_execution(_execution_id(i), task="Write the API documentation")
+                     for i in range(500)))
+        self.assertEqual(self._detect_patterns()[0]['occurrences'], 500)
+
+        self._save(_execution(_execution_id(500)))
+        patterns = {p['keywords']: p['occurrences'] for p in self._detect_patterns()}
+
+        self.assertEqual(patterns, {'documentation write': 499, 'build weather': 1})
+
+    def test_duplicate_learned_workflow_names_saved_once(self):
+        """Test that a repeated workflow name is saved from its first occurrence only."""
+        workflows = [{'name': 'learned-a', 'version': '1'},
+                     {'name': 'learned-b', 'version': '1'},
+                     {'name': 'learned-a', 'version': '2'}]
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            paths = self.learner.save_learned_workflows(workflows)
+
+        self.assertEqual([Path(p).name if p else p for p in paths],
+                         ["learned-a.yaml", "learned-b.yaml", ""])
+        self.assertIn("Duplicate learned workflow name 'learned-a'", output.getvalue())
+        self.assertEqual(yaml.safe_load(Path(paths[0]).read_text())['version'], '1')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,26 @@ Agent Configuration Validator
 Checks for common issues in agent configurations
 """
 
+import contextlib
+import io
 import json
+import os
 import sys
 from pathlib import Path
 from typing import List, Tuple
 
+# Prefer orjson for parsing the registry when installed; falls back to stdlib json
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Stream very large registries agent by agent when ijson is installed
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 class Colors:
     GREEN = '\033[92m'
     YELLOW = '\033[93m'
@@ -16,38 +31,79 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Leave out color codes when output is redirected
+if not sys.stdout.isatty():
+    for _color in ('GREEN', 'YELLOW', 'RED', 'ENDC', 'BOLD'):
+        setattr(Colors, _color, '')
+
+ERROR_PREFIX = f"  {Colors.RED}✗ ERROR: "
+WARNING_PREFIX = f"  {Colors.YELLOW}⚠ WARNING: "
+ISSUE_SUFFIX = Colors.ENDC
+
 REGISTRY_PATH = "agents/registry.json"
-REQUIRED_FIELDS = [
+STREAM_THRESHOLD = 8 * 1024 * 1024  # bytes
+CACHE_PATH = Path(".validate_agents.cache")
+REQUIRED_FIELDS = (
     'name', 'description', 'role', 'tools', 'capabilities',
     'system_prompt', 'model', 'skill_level', 'metrics'
-]
-VALID_MODELS = ['claude-sonnet-4-5', 'claude-opus-4', 'claude-haiku-4']
-VALID_SKILL_LEVELS = ['novice', 'intermediate', 'expert', 'master']
-VALID_TOOLS = [
+)
+REQUIRED_METRICS = (
+    'total_tasks', 'successful_tasks', 'failed_tasks',
+    'total_tokens', 'total_cost', 'avg_completion_time', 'last_used'
+)
+_REQUIRED_FIELD_SET = frozenset(REQUIRED_FIELDS)
+_REQUIRED_METRIC_SET = frozenset(REQUIRED_METRICS)
+VALID_MODELS = frozenset({'claude-sonnet-4-5', 'claude-opus-4', 'claude-haiku-4'})
+VALID_SKILL_LEVELS = frozenset({'novice', 'intermediate', 'expert', 'master'})
+VALID_TOOLS = frozenset({
     'Read', 'Write', 'Edit', 'Glob', 'Grep', 'Bash',
     'WebSearch', 'WebFetch', 'TodoWrite', 'Task'
-]
+})
 
 def load_registry():
     """Load registry file"""
     try:
-        with open(REGISTRY_PATH, 'r') as f:
-            return json.load(f)
+        with open(REGISTRY_PATH, 'rb') as f:
+            return _json_loads(f.read())
     except FileNotFoundError:
         print(f"{Colors.RED}✗ Registry file not found: {REGISTRY_PATH}{Colors.ENDC}")
         return None
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
         print(f"{Colors.RED}✗ Invalid JSON: {e}{Colors.ENDC}")
         return None
 
+def load_registry_items():
+    """Load (agent_name, agent_data) pairs, streaming registries past STREAM_THRESHOLD"""
+    try:
+        size = os.path.getsize(REGISTRY_PATH)
+    except FileNotFoundError:
+        print(f"{Colors.RED}✗ Registry file not found: {REGISTRY_PATH}{Colors.ENDC}")
+        return None
+
+    if ijson is not None and size > STREAM_THRESHOLD:
+        return _stream_registry()
+
+    registry = load_registry()
+    return None if registry is None else registry.items()
+
+def _stream_registry():
+    """Yield registry entries one at a time without loading the whole file"""
+    with open(REGISTRY_PATH, 'rb') as f:
+        try:
+            yield from ijson.kvitems(f, '', use_float=True)
+        except ijson.JSONError as e:
+            print(f"{Colors.RED}✗ Invalid JSON: {e}{Colors.ENDC}")
+            sys.exit(1)
+
 def validate_agent(agent_name: str, agent_data: dict) -> List[Tuple[str, str]]:
     """Validate a single agent configuration"""
     issues = []
 
     # Check required fields
-    for field in REQUIRED_FIELDS:
-        if field not in agent_data:
-            issues.append(('error', f"Missing required field: {field}"))
+    missing = _REQUIRED_FIELD_SET - agent_data.keys()
+    if missing:
+        issues.extend(('error', f"Missing required field: {field}")
+                      for field in REQUIRED_FIELDS if field in missing)
 
     # Validate name matches key
     if 'name' in agent_data and agent_data['name'] != agent_name:
@@ -55,11 +111,11 @@ def validate_agent(agent_name: str, agent_data: dict) -> List[Tuple[str, str]]:
 
     # Validate model
     if 'model' in agent_data and agent_data['model'] not in VALID_MODELS:
-        issues.append(('warning', f"Unknown model: {agent_data['model']}. Valid: {VALID_MODELS}"))
+        issues.append(('warning', f"Unknown model: {agent_data['model']}. Valid: {sorted(VALID_MODELS)}"))
 
     # Validate skill level
     if 'skill_level' in agent_data and agent_data['skill_level'] not in VALID_SKILL_LEVELS:
-        issues.append(('error', f"Invalid skill level: {agent_data['skill_level']}. Valid: {VALID_SKILL_LEVELS}"))
+        issues.append(('error', f"Invalid skill level: {agent_data['skill_level']}. Valid: {sorted(VALID_SKILL_LEVELS)}"))
 
     # Validate tools
     if 'tools' in agent_data:
@@ -79,14 +135,10 @@ def validate_agent(agent_name: str, agent_data: dict) -> List[Tuple[str, str]]:
 
     # Validate metrics structure
     if 'metrics' in agent_data:
-        metrics = agent_data['metrics']
-        required_metrics = [
-            'total_tasks', 'successful_tasks', 'failed_tasks',
-            'total_tokens', 'total_cost', 'avg_completion_time', 'last_used'
-        ]
-        for metric in required_metrics:
-            if metric not in metrics:
-                issues.append(('warning', f"Missing metric: {metric}"))
+        missing = _REQUIRED_METRIC_SET.difference(agent_data['metrics'])
+        if missing:
+            issues.extend(('warning', f"Missing metric: {metric}")
+                          for metric in REQUIRED_METRICS if metric in missing)
 
     # Check for empty strings
     for field in ['description', 'role', 'system_prompt']:
@@ -103,34 +155,92 @@ def validate_agent(agent_name: str, agent_data: dict) -> List[Tuple[str, str]]:
 
     return issues
 
+def _cache_key():
+    """Identify the registry contents and validator version a cached report belongs to"""
+    try:
+        registry_stat = os.stat(REGISTRY_PATH)
+        validator_stat = os.stat(__file__)
+    except OSError:
+        return None
+    return (
+        os.path.abspath(REGISTRY_PATH), registry_stat.st_mtime_ns, registry_stat.st_size,
+        validator_stat.st_mtime_ns, bool(Colors.ENDC)
+    )
+
+def _load_cached_report(key):
+    """Return the cached (output, exit_code) for key, or None"""
+    try:
+        with open(CACHE_PATH, 'rb') as f:
+            cached = _json_loads(f.read())
+        if cached['key'] != list(key):
+            return None
+        output, exit_code = cached['output'], cached['exit_code']
+    except Exception:
+        return None
+    if not isinstance(output, str) or not isinstance(exit_code, int):
+        return None
+    return output, exit_code
+
+def _save_cached_report(key, report):
+    """Store (output, exit_code) for key; failures only cost the next run a revalidation"""
+    output, exit_code = report
+    try:
+        with open(CACHE_PATH, 'w') as f:
+            json.dump({'key': list(key), 'output': output, 'exit_code': exit_code}, f)
+    except OSError:
+        pass
+
 def main():
-    """Main validation function"""
+    """Main validation function; reuses the last report while the registry is unchanged"""
+    key = _cache_key()
+    report = _load_cached_report(key) if key is not None else None
+    if report is not None:
+        output, exit_code = report
+        sys.stdout.write(output)
+        return exit_code
+
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            exit_code = validate_registry()
+    finally:
+        sys.stdout.write(buffer.getvalue())
+
+    if key is not None:
+        _save_cached_report(key, (buffer.getvalue(), exit_code))
+    return exit_code
+
+def validate_registry():
+    """Validate every agent in the registry and print a report"""
     print(f"\n{Colors.BOLD}=== Agent Configuration Validator ==={Colors.ENDC}\n")
 
-    registry = load_registry()
+    registry = load_registry_items()
     if registry is None:
         sys.exit(1)
 
-    total_agents = len(registry)
+    total_agents = 0
     agents_with_issues = 0
     total_errors = 0
     total_warnings = 0
 
-    for agent_name, agent_data in registry.items():
+    for agent_name, agent_data in registry:
+        total_agents += 1
         issues = validate_agent(agent_name, agent_data)
 
         if issues:
             agents_with_issues += 1
-            print(f"{Colors.BOLD}Agent: {agent_name}{Colors.ENDC}")
+            lines = [f"{Colors.BOLD}Agent: {agent_name}{Colors.ENDC}"]
 
             for issue_type, message in issues:
                 if issue_type == 'error':
                     total_errors += 1
-                    print(f"  {Colors.RED}✗ ERROR: {message}{Colors.ENDC}")
+                    lines.append(ERROR_PREFIX + message + ISSUE_SUFFIX)
                 else:
                     total_warnings += 1
-                    print(f"  {Colors.YELLOW}⚠ WARNING: {message}{Colors.ENDC}")
-            print()
+                    lines.append(WARNING_PREFIX + message + ISSUE_SUFFIX)
+
+            # One write per agent instead of one per issue
+            sys.stdout.write("\n".join(lines) + "\n\n")
 
     # Summary
     print(f"{Colors.BOLD}{'='*50}{Colors.ENDC}")